@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML parse time and peak memory per BeautifulSoup backend,
+for a full parse and for the image-only strained parse.
+
+Memory is the growth in max RSS per parsed tree, measured in a fresh process
+per page, backend and mode. Unlike tracemalloc it includes what lxml and
+html5lib allocate in C, so the backends are compared on equal terms.
+
+Pages come from the paths given on the command line, else the scraper's
+page cache (.http_cache/*.body), else the repo's own HTML files.
+
+Usage:
+    python benchmark_parsers.py [--runs N] [page.html ...]
+"""
+
+import sys
+import time
+import argparse
+import resource
+import statistics
+import subprocess
+from pathlib import Path
+
+import http_cache
+from html_parsing import PARSER_BACKENDS, IMAGES_ONLY, make_soup, _backend_available
+
+FALLBACK_PAGES = ["project.html", "projects.html", "about.html"]
+MODES = [("full", None), ("images", IMAGES_ONLY)]
+RSS_TREES = 20  # Trees held at once so one page's growth rises above allocator slack
+
+def find_pages(paths):
+    """Return the list of page files to benchmark."""
+    if paths:
+        return [Path(p) for p in paths]
+    cached = sorted(http_cache.CACHE_DIR.glob("*.body"))
+    if cached:
+        return cached
+    return [Path(p) for p in FALLBACK_PAGES if Path(p).exists()]
+
+def time_parse(markup, backend, parse_only, runs):
+    """Median wall time of parsing markup, in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        make_soup(markup, parse_only=parse_only, parser=backend)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def rss_growth(page, backend, mode):
+    """
+    Growth in this process's max RSS per parsed tree of page, in bytes, from
+    holding RSS_TREES trees at once. Run in a fresh process: the high-water
+    mark can't be reset.
+    """
+    markup = Path(page).read_bytes()
+    make_soup(b"<p></p>", parser=backend)  # Load the backend before taking the baseline
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    soups = [make_soup(markup, parse_only=dict(MODES)[mode], parser=backend) for _ in range(RSS_TREES)]
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    del soups
+    return (after - before) * 1024 // RSS_TREES  # ru_maxrss is in KiB on Linux
+
+def peak_memory(page, backend, mode):
+    """rss_growth() measured in a child process, in bytes."""
+    result = subprocess.run([sys.executable, __file__, '--rss-child', str(page), backend, mode],
+                            capture_output=True, text=True, check=True)
+    return int(result.stdout.split()[-1])
+
+def check_strained(markup, backend):
+    """True if the strained parse finds the same <img> src values as the full parse."""
+    full = [img.get('src') for img in make_soup(markup, parser=backend).find_all('img')]
+    strained = [img.get('src') for img in make_soup(markup, parse_only=IMAGES_ONLY, parser=backend).find_all('img')]
+    return full == strained
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends")
+    parser.add_argument('pages', nargs='*', help="HTML files to parse")
+    parser.add_argument('--runs', type=int, default=5, help="Timed runs per measurement (median is reported)")
+    parser.add_argument('--rss-child', nargs=3, metavar=('PAGE', 'BACKEND', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.rss_child:
+        print(rss_growth(*args.rss_child))
+        return
+
+    pages = find_pages(args.pages)
+    if not pages:
+        print("No pages to benchmark")
+        sys.exit(1)
+
+    backends = [b for b in PARSER_BACKENDS if _backend_available(b)]
+
+    print("=" * 70)
+    print(f"Parsing {len(pages)} pages, {args.runs} runs each")
+    print("=" * 70)
+
+    totals = {(b, m): {"ms": 0.0, "peak": 0} for b in backends for m, _ in MODES}
+    for page in pages:
+        markup = page.read_bytes()
+        print(f"\n{page.name} ({len(markup):,} bytes)")
+        for backend in backends:
+            for mode, strainer in MODES:
+                ms = time_parse(markup, backend, strainer, args.runs)
+                peak = peak_memory(page, backend, mode)
+                totals[(backend, mode)]["ms"] += ms
+                totals[(backend, mode)]["peak"] = max(totals[(backend, mode)]["peak"], peak)
+                print(f"  {backend:<12} {mode:<7} {ms:8.1f} ms  peak RSS +{peak / 1024:10,.0f} KiB")
+            if not check_strained(markup, backend):
+                print(f"  [WARN] {backend}: strained parse found different images")
+
+    print("\n" + "=" * 70)
+    print("Totals")
+    print("=" * 70)
+    for (backend, mode), entry in totals.items():
+        print(f"  {backend:<12} {mode:<7} {entry['ms']:8.1f} ms  max peak RSS +{entry['peak'] / 1024:10,.0f} KiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the site build pipeline:
+
+    scrape_all_projects_final -> all_projects_scraped.json
+      -> update_project_html -> update_projects_final
+      -> update_projects_cards -> add_theme_to_pages
+
+Each stage runs as its own process in a scratch copy of the pages, so the
+real files are never touched. The build inputs the stages read (INPUTS:
+the image tree and the manifests describing it) are taken from the repo, so
+the stages do the same image work as in a real build; inputs the repo
+doesn't have yet are reported with each dataset. For every stage the
+benchmark reports wall time, peak RSS and the size of the files it writes.
+
+Datasets:
+  real   - the repo's all_projects_scraped.json and HTML pages
+  N      - synthetic portfolios of N projects, built by cycling the real
+           projects with fresh ids (default sizes: 23, 1000, 10000)
+
+The scrape stage needs the network, so it only runs when a recorded
+cassette is given (see http_cassette.py); otherwise the dataset's JSON is
+used as its output.
+
+Usage:
+    python benchmark_pipeline.py [--sizes 23 1000 10000] [--no-real]
+                                 [--cassette cassettes/site] [--latency 0.05]
+                                 [--timeout 600] [--save results.json]
+                                 [--compare baseline.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent
+SCRAPED_JSON = "all_projects_scraped.json"
+PAGES = ["project.html", "projects.html", "about.html"]
+STORE = "data/projects.db"  # The generators read and write project data here
+SHARDS = "public/data/projects"  # One JSON file per project, fetched by project.html
+
+# Build inputs the stages read: path, how it enters the scratch directory
+# ('link' read-only, 'copy' when a stage updates it, None if inside a linked
+# directory), and the script that produces it
+INPUTS = [
+    ("public/images", "link", None),
+    ("public/images/optimized/manifest.json", None, "optimize_images.py"),
+    ("data/placeholders.json", "link", "image_placeholders.py"),
+    (".image_dimensions.json", "copy", "image_dimensions.py"),  # A cache the stages save
+]
+
+DEFAULT_SIZES = [23, 1000, 10000]
+STAGE_TIMEOUT = 600  # Seconds before a stage is reported as blown up
+REGRESSION_THRESHOLD = 1.25  # Slower than this ratio vs the baseline is flagged
+
+# name, script, files the stage writes
+STAGES = [
+    ("scrape", "scrape_all_projects_final.py", [SCRAPED_JSON]),
+    ("update_project_html", "update_project_html.py", ["project.html", STORE, SHARDS]),
+    ("update_projects_final", "update_projects_final.py", ["project.html", STORE, SHARDS]),
+    ("update_projects_cards", "update_projects_cards.py", ["projects.html"]),
+    ("add_theme_to_pages", "add_theme_to_pages.py", PAGES),
+]
+
+def synthetic_projects(real, count):
+    """A portfolio of `count` projects made by cycling the real ones under new ids."""
+    templates = list(real.values())
+    projects = {}
+    for i in range(count):
+        project = json.loads(json.dumps(templates[i % len(templates)]))
+        if i >= len(templates):
+            project["project_id"] = f"{project['project_id']}-{i}"
+            project["content"]["title"] = f"{project['content']['title']} {i}"
+        projects[project["project_id"]] = project
+    return projects
+
+def check_isolated(workdir):
+    """Raise RuntimeError unless every stage output resolves inside workdir, and workdir outside the repo."""
+    root = workdir.resolve()
+    if root == REPO_DIR or REPO_DIR in root.parents:
+        raise RuntimeError(f"scratch directory {root} is inside the repo")
+    for _, _, outputs in STAGES:
+        for name in outputs:
+            target = (workdir / name).resolve()
+            if root not in target.parents:
+                raise RuntimeError(f"{name} in the scratch directory resolves to {target}, outside it")
+
+def prepare_workdir(projects):
+    """
+    Scratch directory holding the pages, the project store, the build
+    inputs and the dataset's scraped JSON. Output directories are created in
+    it up front, and checked, so no stage can write into the repo. Returns
+    (workdir, the INPUTS missing from the repo).
+    """
+    workdir = Path(tempfile.mkdtemp(prefix="bench-pipeline-"))
+    missing = []
+    try:
+        for page in PAGES:
+            shutil.copy2(REPO_DIR / page, workdir / page)
+        (workdir / STORE).parent.mkdir()
+        shutil.copy2(REPO_DIR / STORE, workdir / STORE)
+        (workdir / SHARDS).mkdir(parents=True)
+        for name, how, producer in INPUTS:
+            source = REPO_DIR / name
+            if not source.exists():
+                missing.append((name, producer))
+                continue
+            if how:
+                (workdir / name).parent.mkdir(parents=True, exist_ok=True)
+            if how == "link":
+                (workdir / name).symlink_to(source, target_is_directory=source.is_dir())
+            elif how == "copy":
+                shutil.copy2(source, workdir / name)
+        with open(workdir / SCRAPED_JSON, 'w', encoding='utf-8') as f:
+            json.dump(projects, f, indent=2, ensure_ascii=False)
+        check_isolated(workdir)
+    except Exception:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    return workdir, missing
+
+def run_stage(script, workdir, timeout, env=None, args=()):
+    """
+    Run a pipeline script in workdir. Returns (status, wall seconds, peak RSS KiB).
+    status is 'ok', 'timeout' or 'exit N'.
+    """
+    log_path = workdir / f"{Path(script).stem}.log"
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        process = subprocess.Popen([sys.executable, str(REPO_DIR / script), *args], cwd=workdir,
+                                   stdout=log, stderr=subprocess.STDOUT, env=env)
+        deadline = start + timeout
+        while True:
+            pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.perf_counter() > deadline:
+                process.kill()
+                _, status, usage = os.wait4(process.pid, 0)
+                return "timeout", time.perf_counter() - start, usage.ru_maxrss
+            time.sleep(0.01)
+    seconds = time.perf_counter() - start
+    code = os.waitstatus_to_exitcode(status)
+    process.returncode = code
+    return ("ok" if code == 0 else f"exit {code}"), seconds, usage.ru_maxrss
+
+def output_size(workdir, files):
+    """Total bytes of the given files in workdir, counting everything inside directories."""
+    total = 0
+    for name in files:
+        path = workdir / name
+        if path.is_dir():
+            total += sum(child.stat().st_size for child in path.rglob("*") if child.is_file())
+        elif path.exists():
+            total += path.stat().st_size
+    return total
+
+def run_dataset(name, projects, args):
+    """Run every stage on one dataset and return its rows."""
+    workdir, missing = prepare_workdir(projects)
+    for path, producer in missing:
+        print(f"  [MISSING] {path} (python {producer}): the stages run without it")
+    rows = []
+    blown_up = False
+    try:
+        for stage, script, outputs in STAGES:
+            row = {"dataset": name, "projects": len(projects), "stage": stage,
+                   "missing_inputs": [path for path, _ in missing]}
+            if stage == "scrape" and not args.cassette:
+                row.update(status="skipped (no cassette)", seconds=None, peak_rss_kib=None,
+                           output_bytes=output_size(workdir, outputs))
+            elif blown_up:
+                row.update(status="skipped", seconds=None, peak_rss_kib=None, output_bytes=None)
+            else:
+                env = None
+                stage_args = ()
+                if stage == "scrape":
+                    env = dict(os.environ, SCRAPER_CASSETTE=str(Path(args.cassette).resolve()),
+                               SCRAPER_CASSETTE_MODE="replay", SCRAPER_REPLAY_LATENCY=str(args.latency))
+                    stage_args = ("--full",)
+                status, seconds, peak = run_stage(script, workdir, args.timeout, env, stage_args)
+                row.update(status=status, seconds=round(seconds, 3), peak_rss_kib=peak,
+                           output_bytes=output_size(workdir, outputs))
+                # Later stages read this stage's output, so stop at the first failure
+                blown_up = status != "ok"
+            rows.append(row)
+            print_row(row)
+    finally:
+        if args.keep:
+            print(f"  (kept {workdir})")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return rows
+
+def print_row(row):
+    seconds = f"{row['seconds']:9.3f}s" if row['seconds'] is not None else f"{'-':>10}"
+    peak = f"{row['peak_rss_kib'] / 1024:8.1f} MiB" if row['peak_rss_kib'] is not None else f"{'-':>12}"
+    size = f"{row['output_bytes']:>14,} B" if row['output_bytes'] is not None else f"{'-':>16}"
+    print(f"  {row['stage']:<24} {seconds} {peak} {size}  {row['status']}")
+
+def compare(rows, baseline_path):
+    """Print stages that got slower than REGRESSION_THRESHOLD times the baseline."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r["dataset"], r["stage"]): r for r in json.load(f)}
+    regressions = []
+    for row in rows:
+        before = baseline.get((row["dataset"], row["stage"]))
+        if not before or not before.get("seconds") or row["seconds"] is None:
+            continue
+        ratio = row["seconds"] / before["seconds"]
+        if ratio > REGRESSION_THRESHOLD:
+            regressions.append((row, before, ratio))
+    print("\n" + "=" * 70)
+    print(f"Compared with {baseline_path}")
+    print("=" * 70)
+    if not regressions:
+        print("  No regressions")
+    for row, before, ratio in regressions:
+        print(f"  [SLOWER] {row['dataset']}/{row['stage']}: {before['seconds']:.3f}s -> {row['seconds']:.3f}s ({ratio:.2f}x)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the site build pipeline")
+    parser.add_argument('--sizes', type=int, nargs='*', default=DEFAULT_SIZES,
+                        help=f"Synthetic portfolio sizes (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument('--no-real', action='store_true', help="Skip the real dataset")
+    parser.add_argument('--cassette', help="Replay this cassette to include the scrape stage")
+    parser.add_argument('--latency', type=float, default=0.0, help="Injected latency per replayed request")
+    parser.add_argument('--timeout', type=float, default=STAGE_TIMEOUT,
+                        help=f"Seconds per stage before giving up (default: {STAGE_TIMEOUT})")
+    parser.add_argument('--keep', action='store_true', help="Keep the scratch directories")
+    parser.add_argument('--save', help="Write the results as JSON")
+    parser.add_argument('--compare', help="Flag stages slower than in this saved results file")
+    args = parser.parse_args()
+
+    with open(REPO_DIR / SCRAPED_JSON, 'r', encoding='utf-8') as f:
+        real = json.load(f)
+
+    datasets = [] if args.no_real else [("real", real)]
+    datasets += [(str(size), synthetic_projects(real, size)) for size in args.sizes]
+
+    rows = []
+    for name, projects in datasets:
+        print("=" * 70)
+        print(f"Dataset: {name} ({len(projects)} projects)")
+        print("=" * 70)
+        rows += run_dataset(name, projects, args)
+        print()
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+        print(f"Results saved to {args.save}")
+    if args.compare:
+        compare(rows, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Incremental build of the generated site files.
+
+Each step of the pipeline is declared below with the files it reads and
+writes. A step runs only if one of them has changed since its last
+successful run, judged by SHA-256 rather than timestamps. The step's own
+script, and any local modules it imports, count as inputs. Fingerprints of
+every file a step touched are recorded after it runs, in STATE_PATH. A step
+that rewrites a file with identical bytes therefore doesn't cause the steps
+after it to run. Files are only rehashed when their mtime or size changes,
+so a no-op build is a handful of stat() calls. A directory's fingerprint
+covers the names and contents of the files in it.
+
+A step depends on every earlier step that writes one of its inputs or
+outputs. Steps with no path between them run in parallel, such as the
+favicons alongside the projects.html cards.
+
+The scrape step needs the network. It only runs when named explicitly;
+otherwise its output (all_projects_scraped.json and the .jsonl stream) is
+treated as source files.
+
+Usage:
+    python build.py [STEP ...] [--force] [--jobs N] [--list]
+"""
+
+import os
+import ast
+import sys
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import image_store
+import project_store
+import project_stream
+import responsive_images
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = ".build_state.json"
+STORE = str(project_store.STORE_PATH)
+PLACEHOLDERS = str(responsive_images.PLACEHOLDERS_PATH)
+PROJECT_IMAGES = "public/images/projects"  # image_placeholders.SOURCE_DIR (not imported: it needs NumPy and Pillow)
+SHARDS = str(project_store.SHARD_DIR)
+# The generators read the scrape through project_stream, from whichever of these is newer
+SCRAPED = [str(project_stream.JSON_PATH), str(project_stream.JSONL_PATH)]
+FAVICONS = ["app/icon.png", "app/icon-16x16.png", "app/icon-32x32.png", "app/apple-icon.png", "app/favicon.ico"]
+
+def local_imports(script, seen=None):
+    """Modules in the repo that script imports, directly or through each other."""
+    seen = set() if seen is None else seen
+    try:
+        with open(os.path.join(REPO_DIR, script), 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), script)
+    except (OSError, SyntaxError):
+        return sorted(seen)  # The step fails when it runs; its own file is still an input
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            module = name.split('.')[0] + ".py"
+            if module not in seen and os.path.exists(os.path.join(REPO_DIR, module)):
+                seen.add(module)
+                local_imports(module, seen)
+    return sorted(seen)
+
+class Step:
+    """One script of the pipeline, with the files it reads and writes."""
+
+    def __init__(self, name, script, inputs, outputs, manual=False, args=()):
+        self.name = name
+        self.script = script
+        self.args = list(args)
+        self.inputs = [script, *local_imports(script), *inputs]
+        self.outputs = outputs
+        self.manual = manual  # Only run when named on the command line
+        self.deps = []
+
+# In pipeline order; steps editing the same file run in this order
+STEPS = [
+    Step("scrape", "scrape_all_projects_final.py", [], SCRAPED, manual=True),
+    Step("placeholders", "image_placeholders.py", [PROJECT_IMAGES], [PLACEHOLDERS]),
+    Step("update_project_html", "update_project_html.py",
+         [*SCRAPED, PLACEHOLDERS], [STORE, "project.html", SHARDS]),
+    Step("update_projects_final", "update_projects_final.py",
+         [*SCRAPED, PLACEHOLDERS], [STORE, "project.html", SHARDS]),
+    Step("fix_indent", "fix_indent.py", [], ["project.html"]),
+    Step("update_projects_cards", "update_projects_cards.py",
+         [STORE, str(responsive_images.MANIFEST_PATH), PLACEHOLDERS], ["projects.html"]),
+    Step("projects_ts", "project_store.py", [STORE], [str(project_store.TS_PATH)], args=["ts"]),
+    Step("add_theme_to_pages", "add_theme_to_pages.py", [], ["about.html", "projects.html", "project.html"]),
+    Step("generate_favicon", "generate_favicon.py", ["public/images/bc-logo.png"], FAVICONS),
+]
+
+def link_steps(steps):
+    """Point each step at the earlier steps writing any file it reads or writes."""
+    for i, step in enumerate(steps):
+        touched = set(step.inputs) | set(step.outputs)
+        step.deps = [earlier for earlier in steps[:i] if touched & set(earlier.outputs)]
+
+class BuildState:
+    """File fingerprints, and what each step saw the last time it succeeded."""
+
+    def __init__(self, path=STATE_PATH):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        self.files = state.get("files", {})  # path -> [mtime_ns, size, sha256]
+        self.steps = state.get("steps", {})  # step name -> {path: sha256 or None}
+
+    def digest(self, path):
+        """SHA-256 of a file, or None if it doesn't exist. Rehashed only when its stat changes."""
+        if os.path.isdir(path):
+            return self.directory_digest(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.files.pop(path, None)
+            return None
+        entry = self.files.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        digest = image_store.hash_file(path)
+        self.files[path] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+
+    def directory_digest(self, path):
+        """SHA-256 over the names and digests of the files in a directory."""
+        combined = hashlib.sha256()
+        for name in sorted(os.listdir(path)):
+            combined.update(f"{name}\0{self.digest(os.path.join(path, name))}\n".encode('utf-8'))
+        return combined.hexdigest()
+
+    def fingerprint(self, step):
+        return {path: self.digest(path) for path in dict.fromkeys(step.inputs + step.outputs)}
+
+    def is_current(self, step):
+        return self.steps.get(step.name) == self.fingerprint(step)
+
+    def record(self, step, upstream=()):
+        """
+        Store what step left behind. Files it rewrote in place are also
+        updated in the records of the upstream steps given (ones that ran or
+        were current in this build), so they don't look stale next time.
+        """
+        fingerprint = self.steps[step.name] = self.fingerprint(step)
+        for earlier in upstream:
+            recorded = self.steps.get(earlier.name, {})
+            for path in set(earlier.outputs) & set(step.outputs):
+                if path in recorded:
+                    recorded[path] = fingerprint[path]
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"files": self.files, "steps": self.steps}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+def select(steps, targets):
+    """The named steps and everything they depend on; all non-manual steps by default."""
+    if not targets:
+        return [step for step in steps if not step.manual]
+    chosen = set()
+    pending = [step for step in steps if step.name in targets]
+    while pending:
+        step = pending.pop()
+        if step.name not in chosen:
+            chosen.add(step.name)
+            pending.extend(dep for dep in step.deps if not dep.manual or dep.name in targets)
+    return [step for step in steps if step.name in chosen]
+
+def run_step(step):
+    """Run a step's script. Returns (exit code, combined output, seconds)."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, step.script, *step.args], cwd=REPO_DIR, capture_output=True, text=True)
+    return result.returncode, result.stdout + result.stderr, time.perf_counter() - start
+
+def build(steps, state, force=False, jobs=None):
+    """Run the stale steps, independent ones in parallel. Returns the names of failed steps."""
+    selected = {step.name for step in steps}
+    done = set()
+    failed = []
+    running = {}
+    waiting = list(steps)
+
+    with ThreadPoolExecutor(jobs) as pool:
+        while waiting or running:
+            for step in list(waiting):
+                deps = [dep.name for dep in step.deps if dep.name in selected]
+                if any(dep in failed for dep in deps):
+                    waiting.remove(step)
+                    failed.append(step.name)
+                    print(f"  [SKIP] {step.name}: a step it depends on failed")
+                elif all(dep in done for dep in deps):
+                    waiting.remove(step)
+                    # Hashing happens here, on the main thread, once the inputs are final
+                    if not force and state.is_current(step):
+                        done.add(step.name)
+                        print(f"  [UP TO DATE] {step.name}")
+                    else:
+                        running[pool.submit(run_step, step)] = step
+                        print(f"  [RUN] {step.name}")
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                code, output, elapsed = future.result()
+                for line in output.rstrip().splitlines():
+                    print(f"    {step.name}: {line}")
+                if code == 0:
+                    state.record(step, [dep for dep in step.deps if dep.name in done])
+                    state.save()
+                    done.add(step.name)
+                    print(f"  [OK] {step.name} ({elapsed:.2f}s)")
+                else:
+                    failed.append(step.name)
+                    print(f"  [ERROR] {step.name} exited with {code}")
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the generated site files whose inputs changed")
+    parser.add_argument('targets', nargs='*', metavar='STEP', help="Steps to build, with their dependencies")
+    parser.add_argument('--force', action='store_true', help="Run the steps even if they are up to date")
+    parser.add_argument('--jobs', type=int, default=None, help="Steps to run at once (default: as many as possible)")
+    parser.add_argument('--list', action='store_true', help="List the steps and exit")
+    args = parser.parse_args()
+
+    os.chdir(REPO_DIR)
+    link_steps(STEPS)
+    unknown = set(args.targets) - {step.name for step in STEPS}
+    if unknown:
+        parser.error(f"unknown step(s): {', '.join(sorted(unknown))}")
+
+    if args.list:
+        for step in STEPS:
+            after = ", ".join(dep.name for dep in step.deps) or "-"
+            print(f"{step.name:<24} after: {after}{'  (manual)' if step.manual else ''}")
+        return
+
+    print("=" * 70)
+    print("Building site")
+    print("=" * 70)
+    start = time.perf_counter()
+    state = BuildState()
+    failed = build(select(STEPS, args.targets), state, force=args.force, jobs=args.jobs)
+    state.save()
+    print(f"\nFinished in {time.perf_counter() - start:.2f}s"
+          + (f", {len(failed)} failed: {', '.join(failed)}" if failed else ""))
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
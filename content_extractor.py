@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Single-pass extraction of a project page's structured content.
+
+The page is walked once (html_parsing.DocumentIndex). Every text node is
+checked against one combined label pattern, and only the rare strings that
+hit it are matched against the individual labels in CONTENT_LABELS. The
+first match per label wins, as with soup.find(string=...). The block after
+each label is then located by bisecting the index, so the cost stays linear
+in page size however many labels are added.
+"""
+
+import re
+
+from html_parsing import DocumentIndex
+
+# field -> label pattern, matched against every text node in document order
+CONTENT_LABELS = {
+    "description": re.compile(r'Project Overview|Overview', re.I),
+    "timeline": re.compile(r'Project Timeline|Timeline', re.I),
+    "role": re.compile(r'My role|Role|My Role', re.I),
+    "goals": re.compile(r'Goals|Goal', re.I),
+    "research": re.compile(r'Data Analysis|User Research|Research', re.I),
+    "findings": re.compile(r'Findings', re.I),
+}
+
+# Cheap prefilter: a string that misses this can't match any label
+_ANY_LABEL = re.compile('|'.join(f'(?:{p.pattern})' for p in CONTENT_LABELS.values()), re.I)
+
+class _LabelScan:
+    """Collects the label strings seen during the document walk."""
+
+    def __init__(self):
+        self.first = {}
+        self.findings = []
+
+    def __call__(self, index, string):
+        if not _ANY_LABEL.search(string):
+            return
+        for field, pattern in CONTENT_LABELS.items():
+            if field == "findings":
+                # Findings are looked up inside the research block, so keep every hit
+                if pattern.search(string):
+                    self.findings.append(index)
+            elif field not in self.first and pattern.search(string):
+                self.first[field] = string
+
+def _list_items(index, list_tag):
+    """Non-empty stripped texts of the <li> elements under list_tag."""
+    items = []
+    for li in index.find_all_within(list_tag, 'li'):
+        text = li.get_text(strip=True)
+        if text:
+            items.append(text)
+    return items
+
+def _findings_within(index, scan, tag):
+    """First Findings label string inside tag, like tag.find(string=...)."""
+    start, end = index.position(tag), index.end(tag)
+    for position in scan.findings:
+        if start < position <= end:
+            return index.elements[position]
+    return None
+
+def extract_content(soup):
+    """Extract structured content from page."""
+    content = {
+        "title": "",
+        "subtitle": "",
+        "description": "",
+        "timeline": "",
+        "role": "",
+        "outcome": "",
+        "goals": [],
+        "research": {"method": "", "findings": [], "oldVersion": None}
+    }
+
+    scan = _LabelScan()
+    index = DocumentIndex(soup, on_string=scan)
+
+    # Title, and subtitle from the next h2/h3 sibling
+    h1 = index.first('h1')
+    if h1:
+        content["title"] = h1.get_text(strip=True)
+        next_heading = h1.find_next_sibling(['h2', 'h3'])
+        if next_heading:
+            content["subtitle"] = next_heading.get_text(strip=True)
+
+    # Single-value fields: the first matching block after the label
+    for field, names in (("description", ['p', 'div']),
+                         ("timeline", ['p', 'div', 'span']),
+                         ("role", ['p', 'div'])):
+        label = scan.first.get(field)
+        if label is not None and label.parent is not None:
+            value = index.find_next(label.parent, names)
+            if value:
+                content[field] = value.get_text(strip=True)
+
+    # Goals
+    label = scan.first.get("goals")
+    if label is not None and label.parent is not None:
+        goals_list = index.find_next(label.parent, ['ul', 'ol'])
+        if goals_list:
+            content["goals"] = _list_items(index, goals_list)
+
+    # Research method and findings
+    label = scan.first.get("research")
+    if label is not None and label.parent is not None:
+        parent = label.parent
+        method_p = index.find_next(parent, 'p')
+        if method_p:
+            content["research"]["method"] = method_p.get_text(strip=True)
+
+        findings_label = _findings_within(index, scan, parent)
+        if findings_label is not None and findings_label.parent is not None:
+            findings_list = index.find_next(findings_label.parent, ['ul', 'ol'])
+            if findings_list:
+                content["research"]["findings"] = _list_items(index, findings_list)
+
+    return content
@@ -70,7 +70,10 @@ const projectsRaw: Project[] = [
     },
     timeline: "June 2024 to Sep 2025",
     role: "Worked closely with compliance and cross-functional teams to design and launch multiple high-impact features across sportsbook and casino. Led the creation of the Reward Center, Credit Shop, and loyalty milestone systems, as well as engagement features like Caesars Rewards tier gated leaderboards as well as sponsored leaderboards. All projects were user experience-driven features with thousands of players relying on seamless registration, rewards, and gameplay integrations daily.",
-    stats: ["32% improved FTD", "60% reduction in CS tickets"],
+    stats: [
+      "32% improved FTD",
+      "60% reduction in CS tickets",
+    ],
     images: [
       "/images/projects/caesars-palace-online-casino/cpo-headerpng.png",
       "/images/projects/caesars-palace-online-casino/image_3png.png",
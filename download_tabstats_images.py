@@ -4,11 +4,12 @@ Script to download all Tabstats Dashboard images from Squarespace CDN to local s
 """
 
 import os
-import requests
 from pathlib import Path
 from urllib.parse import urlparse
 import re
 
+import http_client
+
 OUTPUT_DIR = Path("public/images/projects/tabstats")
 DESIGN_SYSTEM_DIR = OUTPUT_DIR / "design-system"
 
@@ -65,40 +66,8 @@ def slugify_filename(url):
 
 def download_image(url, filepath):
     """Download an image from URL to filepath."""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        print(f"Downloading: {os.path.basename(filepath)}...")
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-        
-        # Determine file extension from content type or URL
-        ext = os.path.splitext(urlparse(url).path)[1]
-        if not ext or ext not in ['.jpg', '.jpeg', '.png', '.webp']:
-            content_type = response.headers.get('content-type', '')
-            if 'jpeg' in content_type or 'jpg' in content_type:
-                ext = '.jpg'
-            elif 'png' in content_type:
-                ext = '.png'
-            elif 'webp' in content_type:
-                ext = '.webp'
-            else:
-                ext = '.png'
-        
-        if not filepath.endswith(ext):
-            filepath = os.path.splitext(filepath)[0] + ext
-        
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
-        
-        file_size = os.path.getsize(filepath)
-        print(f"  [OK] Saved: {filepath} ({file_size:,} bytes)")
-        return filepath
-    except Exception as e:
-        print(f"  [ERROR] Failed to download {url}: {e}")
-        return None
+    print(f"Downloading: {os.path.basename(filepath)}...")
+    return http_client.download_image(url, filepath)
 
 def main():
     """Main download function."""
@@ -146,6 +115,8 @@ def main():
     print("Downloaded files:")
     for category, path in downloaded:
         print(f"  - {path}")
+    
+    http_client.print_connection_stats()
 
 if __name__ == "__main__":
     main()
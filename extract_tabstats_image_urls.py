@@ -3,11 +3,12 @@
 Script to extract actual image URLs from the Tabstats Dashboard case study page
 """
 
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import json
 
+import http_cache
+from html_parsing import ImagePage
+
 BASE_URL = "https://www.bcampbelldesigns.com/portfolio/tabstats-dashboard-companion"
 
 def main():
@@ -18,17 +19,14 @@ def main():
     print(f"Target URL: {BASE_URL}\n")
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(BASE_URL, headers=headers, timeout=30)
-        response.raise_for_status()
+        response = http_cache.get_page(BASE_URL)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Only <img> tags are parsed up front; the full tree is built on demand for context
+        page = ImagePage(response.content)
         print("[OK] Page loaded successfully\n")
         
         # Find all images
-        all_images = soup.find_all('img')
+        all_images = page.images
         
         # Image categories
         detailed_view_images = []
@@ -51,7 +49,7 @@ def main():
         
         print("Found images:\n")
         
-        for img in all_images:
+        for index, img in enumerate(all_images):
             src = img.get('src') or img.get('data-src') or img.get('data-lazy-src')
             if not src or src.startswith('data:'):
                 continue
@@ -81,18 +79,16 @@ def main():
                 detailed_view_images.append(src)
             else:
                 # Check parent context
-                parent = img.find_parent()
-                if parent:
-                    parent_text = parent.get_text().lower()
-                    if 'design system' in parent_text or 'component' in parent_text:
-                        print(f"  [DESIGN SYSTEM] {src}")
-                        design_system_images.append(src)
-                    elif 'detailed view' in parent_text or 'mockup' in parent_text:
-                        print(f"  [DETAILED VIEW] {src}")
-                        detailed_view_images.append(src)
-                    else:
-                        print(f"  [OTHER] {src}")
-                        other_images.append(src)
+                parent_text = page.parent_text(index)
+                if 'design system' in parent_text or 'component' in parent_text:
+                    print(f"  [DESIGN SYSTEM] {src}")
+                    design_system_images.append(src)
+                elif 'detailed view' in parent_text or 'mockup' in parent_text:
+                    print(f"  [DETAILED VIEW] {src}")
+                    detailed_view_images.append(src)
+                else:
+                    print(f"  [OTHER] {src}")
+                    other_images.append(src)
         
         # Output JSON structure
         print("\n" + "=" * 70)
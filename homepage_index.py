@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+One-pass index of the portfolio homepage for matching projects to images.
+
+Both image scrapers used to run every matching strategy against the whole
+DOM once per project title. HomepageIndex walks the page once and keeps:
+  - title -> text nodes containing it (one combined pattern over every string)
+  - the project-card elements, with their text computed once
+  - keyword -> cards and filename keyword -> <img> maps
+  - document positions, so "images under this element" is a bisection
+Every project is then resolved from those maps, producing the same candidate
+list, in the same order, as the per-project scans did.
+"""
+
+import os
+import re
+from urllib.parse import urlparse
+
+from html_parsing import DocumentIndex
+
+CARD_TAGS = ('div', 'article', 'section', 'li')
+CARD_CLASS = re.compile(r'project|portfolio|work|item|card|gallery', re.I)
+BACKGROUND_URL = re.compile(r'url\(["\']?([^"\')]+)["\']?\)')
+SKIP_WORDS = ['logo', 'icon', 'favicon', 'avatar', 'social']
+ANCESTOR_LEVELS = 7
+
+def normalize_title(title):
+    """Normalize title for matching (case-insensitive, strip whitespace)."""
+    return title.strip().lower()
+
+def title_keywords(title):
+    """Lowercased words of a title longer than 3 characters."""
+    return [word.lower() for word in title.split() if len(word) > 3]
+
+def image_src(img):
+    """The usable image URL of an <img>, or None for missing/data: URLs."""
+    src = img.get('src') or img.get('data-src') or img.get('data-lazy-src') or img.get('data-original')
+    if src and not src.startswith('data:'):
+        return src
+    return None
+
+def background_url(tag):
+    """The url(...) in a tag's inline style, or None."""
+    style = tag.get('style')
+    if style:
+        match = BACKGROUND_URL.search(style)
+        if match:
+            return match.group(1)
+    return None
+
+def _is_card(tag):
+    """Same test as soup.find_all(CARD_TAGS, class_=CARD_CLASS)."""
+    if tag.name not in CARD_TAGS:
+        return False
+    classes = tag.get('class')
+    if not classes:
+        return False
+    if isinstance(classes, str):
+        classes = [classes]
+    return any(CARD_CLASS.search(c) for c in classes) or bool(CARD_CLASS.search(' '.join(classes)))
+
+class HomepageIndex:
+    """Index of a parsed homepage that resolves project titles to candidate images."""
+
+    def __init__(self, soup, titles, card_backgrounds=False):
+        self.card_backgrounds = card_backgrounds
+        self.titles = list(titles)
+        self._title_patterns = {t: re.compile(re.escape(t), re.IGNORECASE) for t in self.titles}
+        any_title = re.compile('|'.join(re.escape(t) for t in self.titles), re.IGNORECASE) if self.titles else None
+
+        # title -> matching text nodes, collected during the single walk
+        self.title_strings = {t: [] for t in self.titles}
+
+        def on_string(index, string):
+            if any_title is None or not any_title.search(string):
+                return
+            for title, pattern in self._title_patterns.items():
+                if pattern.search(string):
+                    self.title_strings[title].append(string)
+
+        self.doc = DocumentIndex(soup, on_string=on_string)
+
+        self.cards = [(el, el.get_text().lower()) for el in self.doc.elements
+                      if getattr(el, 'name', None) in CARD_TAGS and _is_card(el)]
+
+        self.images = [(img, image_src(img)) for img in self.doc.find_all_within(soup, 'img')]
+        self._image_filenames = [
+            os.path.basename(urlparse(src).path).lower() if src else None
+            for _, src in self.images
+        ]
+
+        # keyword -> card indexes / image indexes, filled once per distinct keyword
+        self._cards_by_needle = {}
+        self._images_by_keyword = {}
+
+    def _cards_containing(self, needle):
+        """Indexes of cards whose text contains needle."""
+        if needle not in self._cards_by_needle:
+            self._cards_by_needle[needle] = {i for i, (_, text) in enumerate(self.cards) if needle in text}
+        return self._cards_by_needle[needle]
+
+    def _images_named(self, keyword):
+        """Indexes of images whose filename contains keyword."""
+        if keyword not in self._images_by_keyword:
+            self._images_by_keyword[keyword] = {
+                i for i, filename in enumerate(self._image_filenames)
+                if filename is not None and keyword in filename
+            }
+        return self._images_by_keyword[keyword]
+
+    def _images_under(self, tag):
+        """Usable image URLs under tag, in document order, like tag.find_all('img')."""
+        return [src for src in map(image_src, self.doc.find_all_within(tag, 'img')) if src]
+
+    def find_images(self, title):
+        """
+        Candidate image URLs for a project title, best first.
+        Same strategies and order as the old per-project find_project_images.
+        """
+        images = []
+        normalized_title = normalize_title(title)
+        key_words = title_keywords(title)
+
+        # Strategy 1: containers up to ANCESTOR_LEVELS above text mentioning the title
+        strings = self.title_strings.get(title)
+        if strings is None:
+            pattern = re.compile(re.escape(title), re.IGNORECASE)
+            strings = [el for el in self.doc.elements if isinstance(el, str) and pattern.search(el)]
+        for element in strings:
+            parent = element.parent
+            for _ in range(ANCESTOR_LEVELS):
+                if parent is None:
+                    break
+                images.extend(self._images_under(parent))
+                bg = background_url(parent)
+                if bg:
+                    images.append(bg)
+                parent = parent.parent
+
+        # Strategy 2: project cards whose text mentions the title or a keyword
+        matching = set(self._cards_containing(normalized_title))
+        for word in key_words:
+            matching |= self._cards_containing(word)
+        for i in sorted(matching):
+            card = self.cards[i][0]
+            images.extend(self._images_under(card))
+            if self.card_backgrounds:
+                bg = background_url(card)
+                if bg:
+                    images.append(bg)
+
+        # Strategy 3: images whose filename contains a keyword
+        named = set()
+        for word in key_words:
+            named |= self._images_named(word)
+        images.extend(self.images[i][1] for i in sorted(named))
+
+        # Remove duplicates and filter out small images (likely icons)
+        unique_images = []
+        seen = set()
+        for img_url in images:
+            if img_url in seen:
+                continue
+            seen.add(img_url)
+            if any(skip in img_url.lower() for skip in SKIP_WORDS):
+                continue
+            unique_images.append(img_url)
+        return unique_images
+
+    def resolve_all(self):
+        """Map every indexed title to its candidate image URLs."""
+        return {title: self.find_images(title) for title in self.titles}
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Shared HTML parsing helpers for the scrapers.
+
+Parsing goes through a pluggable BeautifulSoup backend: lxml by default
+(it's already in requirements.txt), with html.parser as the fallback when lxml
+isn't installed. Set SCRAPER_HTML_PARSER to force a backend.
+
+Scrapers that only need images can pass a SoupStrainer so the rest of the
+page is never turned into a tree.
+"""
+
+import os
+from bisect import bisect_right
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+PARSER_BACKENDS = ['lxml', 'html.parser']
+
+# Strainers for partial parsing
+IMAGES_ONLY = SoupStrainer('img')
+IMAGES_AND_STYLES = SoupStrainer(['img', 'style'])
+INLINE_STYLES = SoupStrainer(attrs={'style': True})
+
+def _backend_available(backend):
+    """True if BeautifulSoup can use the given parser backend."""
+    if backend == 'lxml':
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            return False
+    return True
+
+def default_parser():
+    """Return the parser backend to use: SCRAPER_HTML_PARSER, else lxml, else html.parser."""
+    requested = os.environ.get('SCRAPER_HTML_PARSER')
+    if requested:
+        return requested
+    for backend in PARSER_BACKENDS:
+        if _backend_available(backend):
+            return backend
+    return 'html.parser'
+
+PARSER = default_parser()
+
+def make_soup(markup, parse_only=None, parser=None):
+    """Parse markup with the configured backend, optionally limited by a SoupStrainer."""
+    return BeautifulSoup(markup, parser or PARSER, parse_only=parse_only)
+
+class ImagePage:
+    """
+    An image-focused view of a page: <img> tags come from a strained parse,
+    and the full tree is only built if a caller asks for an image's context.
+    """
+
+    def __init__(self, markup, parser=None):
+        self.markup = markup
+        self.parser = parser or PARSER
+        self.images = make_soup(markup, parse_only=IMAGES_ONLY, parser=self.parser).find_all('img')
+        self._full_images = None
+
+    def parent_text(self, index):
+        """Lowercased text of the parent of the index-th image, parsing the full page on first use."""
+        if self._full_images is None:
+            self._full_images = make_soup(self.markup, parser=self.parser).find_all('img')
+        parent = self._full_images[index].find_parent()
+        return parent.get_text().lower() if parent else ''
+
+class DocumentIndex:
+    """
+    Document-order index of a parsed page, built in one pass.
+
+    Every element gets its position in document order, every tag the position
+    of its last descendant, and every tag name a sorted list of positions, so
+    find_next()/find_all_within() are bisections instead of tree walks.
+    """
+
+    def __init__(self, soup, on_string=None):
+        self.soup = soup
+        self.elements = []
+        self._pos = {id(soup): -1}
+        self._end = {}
+        self._by_name = {}
+
+        open_tags = []
+        for index, element in enumerate(soup.descendants):
+            parent = element.parent
+            while open_tags and open_tags[-1] is not parent:
+                self._end[id(open_tags.pop())] = index - 1
+            self.elements.append(element)
+            self._pos[id(element)] = index
+            if isinstance(element, Tag):
+                self._by_name.setdefault(element.name, []).append(index)
+                open_tags.append(element)
+            elif on_string is not None:
+                on_string(index, element)
+        last = len(self.elements) - 1
+        for tag in open_tags:
+            self._end[id(tag)] = last
+        self._end[id(soup)] = last
+
+    def position(self, element):
+        """Document-order position of an element (-1 for the soup itself)."""
+        return self._pos[id(element)]
+
+    def end(self, tag):
+        """Position of the last descendant of tag (its own position if it has none)."""
+        return self._end.get(id(tag), self.position(tag))
+
+    def find_next(self, element, names):
+        """First tag named in names after element in document order, like element.find_next(names)."""
+        if element is self.soup:
+            # The soup object has no next_element, so bs4 finds nothing from it
+            return None
+        start = self.position(element)
+        best = None
+        for name in ([names] if isinstance(names, str) else names):
+            positions = self._by_name.get(name, ())
+            i = bisect_right(positions, start)
+            if i < len(positions) and (best is None or positions[i] < best):
+                best = positions[i]
+        return self.elements[best] if best is not None else None
+
+    def find_all_within(self, tag, name):
+        """Descendants of tag with the given name, in document order, like tag.find_all(name)."""
+        positions = self._by_name.get(name, ())
+        lo = bisect_right(positions, self.position(tag))
+        hi = bisect_right(positions, self.end(tag))
+        return [self.elements[i] for i in positions[lo:hi]]
+
+    def first(self, name):
+        """First tag with the given name, like soup.find(name)."""
+        positions = self._by_name.get(name)
+        return self.elements[positions[0]] if positions else None
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Persistent conditional-GET cache for scraped HTML pages.
+
+Bodies are stored on disk together with their ETag/Last-Modified validators.
+Later runs revalidate with If-None-Match/If-Modified-Since, and a 304 answer is
+served from disk without transferring the page again.
+"""
+
+import os
+import json
+import hashlib
+import threading
+import time
+from pathlib import Path
+
+import http_client
+
+CACHE_DIR = Path(".http_cache")
+
+_stats = {"fresh": 0, "revalidated": 0, "bytes_saved": 0}
+_stats_lock = threading.Lock()
+
+class CachedPage:
+    """A fetched page, either freshly downloaded or served from the cache."""
+
+    def __init__(self, url, content, headers, from_cache):
+        self.url = url
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+
+    @property
+    def encoding(self):
+        content_type = self.headers.get('content-type', '')
+        if 'charset=' in content_type:
+            return content_type.split('charset=', 1)[1].split(';')[0].strip()
+        return 'utf-8'
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+def _cache_paths(url):
+    """Return the (body, metadata) paths for a URL."""
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return CACHE_DIR / f"{key}.body", CACHE_DIR / f"{key}.json"
+
+def _load_entry(url):
+    """Load cached metadata and body for a URL, or (None, None)."""
+    body_path, meta_path = _cache_paths(url)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    if meta.get("url") != url:
+        return None, None
+    return meta, body
+
+def _write_atomic(path, data):
+    """Write bytes to path via a temp file so readers never see partial files."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _store_entry(url, response, body):
+    """Persist a 200 response and its validators."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    body_path, meta_path = _cache_paths(url)
+    meta = {
+        "url": url,
+        "etag": response.headers.get('ETag'),
+        "last_modified": response.headers.get('Last-Modified'),
+        "content_type": response.headers.get('Content-Type', ''),
+        "fetched_at": time.time(),
+    }
+    _write_atomic(body_path, body)
+    _write_atomic(meta_path, json.dumps(meta, indent=2).encode('utf-8'))
+
+def get_page(url, use_cache=True):
+    """
+    Fetch a page, revalidating any cached copy with a conditional GET.
+    Returns a CachedPage; raises on HTTP errors like http_client.get.
+    """
+    meta, body = _load_entry(url) if use_cache else (None, None)
+
+    headers = {}
+    if meta is not None:
+        if meta.get("etag"):
+            headers['If-None-Match'] = meta["etag"]
+        if meta.get("last_modified"):
+            headers['If-Modified-Since'] = meta["last_modified"]
+
+    response = http_client.get_session().get(url, headers=headers, timeout=http_client.TIMEOUT)
+
+    if response.status_code == 304 and meta is not None:
+        with _stats_lock:
+            _stats["revalidated"] += 1
+            _stats["bytes_saved"] += len(body)
+        return CachedPage(url, body, {'content-type': meta.get("content_type", '')}, from_cache=True)
+
+    response.raise_for_status()
+    content = response.content
+    if use_cache and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+        _store_entry(url, response, content)
+    with _stats_lock:
+        _stats["fresh"] += 1
+    return CachedPage(url, content, response.headers, from_cache=False)
+
+def cache_stats():
+    """Return a copy of the revalidation counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+def print_cache_stats():
+    """Print how many pages were served from the cache."""
+    stats = cache_stats()
+    if not stats["fresh"] and not stats["revalidated"]:
+        return
+    print(f"\nPage cache: {stats['revalidated']} revalidated (304), {stats['fresh']} downloaded, "
+          f"{stats['bytes_saved']:,} bytes not re-transferred")
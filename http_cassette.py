@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Record/replay HTTP cassettes for running the scrapers offline.
+
+A cassette is a directory holding interactions.jsonl (one line per URL:
+status, headers, body hash) and bodies/<sha256>.gz, with each distinct body
+stored once. It plugs in as the transport adapter of http_client's shared
+session, so every scraper records or replays without code changes.
+
+Record mode fetches each URL from the network once, without conditional
+or Range headers, and stores the full response. Replay mode serves stored
+responses with an injected latency. Both answer If-None-Match /
+If-Modified-Since with 304 and Range / If-Range with 206 from the stored body,
+so the page cache and resumable downloads behave as they do against the real
+site. URLs missing from a replayed cassette fail like a connection error.
+
+Select a cassette with environment variables:
+    SCRAPER_CASSETTE=cassettes/site SCRAPER_CASSETTE_MODE=record python scrape_all_projects_final.py
+    SCRAPER_CASSETTE=cassettes/site SCRAPER_REPLAY_LATENCY=0.05 python scrape_all_projects_final.py
+
+or through the wrapper, which also times the run:
+    python http_cassette.py record cassettes/site scrape_all_projects_final.py
+    python http_cassette.py replay --latency 0.05 cassettes/site scrape_project_images.py
+    python http_cassette.py info cassettes/site
+"""
+
+import io
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import subprocess
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+import rate_limit
+
+MODES = ('record', 'replay')
+DEFAULT_LATENCY = 0.0  # Seconds added to every replayed response
+
+# Request headers that make the answer depend on the client's state
+CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since', 'Range', 'If-Range')
+# Response headers that no longer describe the stored (decoded) body
+DROPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length', 'connection', 'keep-alive')
+
+_config = {
+    "path": os.environ.get('SCRAPER_CASSETTE'),
+    "mode": os.environ.get('SCRAPER_CASSETTE_MODE', 'replay'),
+    "latency": float(os.environ.get('SCRAPER_REPLAY_LATENCY', DEFAULT_LATENCY)),
+    "jitter": float(os.environ.get('SCRAPER_REPLAY_JITTER', 0.0)),
+}
+
+class Cassette:
+    """On-disk store of recorded responses, keyed by method and URL."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.index_path = self.path / "interactions.jsonl"
+        self.bodies_dir = self.path / "bodies"
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[(entry["method"], entry["url"])] = entry
+        except OSError:
+            pass
+
+    def get(self, method, url):
+        return self.entries.get((method, url))
+
+    def body(self, entry):
+        """The stored body of an entry."""
+        if not entry.get("sha256"):
+            return b''
+        with gzip.open(self.bodies_dir / f"{entry['sha256']}.gz", 'rb') as f:
+            return f.read()
+
+    def add(self, method, url, status, headers, body):
+        """Store a response; later recordings of the same URL win."""
+        digest = hashlib.sha256(body).hexdigest() if body else None
+        entry = {
+            "method": method,
+            "url": url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS},
+            "sha256": digest,
+            "size": len(body),
+        }
+        with self._lock:
+            if digest:
+                body_path = self.bodies_dir / f"{digest}.gz"
+                if not body_path.exists():
+                    self.bodies_dir.mkdir(parents=True, exist_ok=True)
+                    tmp_path = body_path.with_name(f"{body_path.name}.{os.getpid()}.tmp")
+                    with gzip.open(tmp_path, 'wb') as f:
+                        f.write(body)
+                    os.replace(tmp_path, body_path)
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+            self.entries[(method, url)] = entry
+        return entry
+
+def _header(headers, name):
+    """Case-insensitive lookup in a stored header dict."""
+    for key, value in headers.items():
+        if key.lower() == name.lower():
+            return value
+    return None
+
+def _answer(request, entry, body):
+    """
+    Work out what a server holding `entry` would send for `request`.
+    Returns (status, headers, body).
+    """
+    headers = dict(entry["headers"])
+    status = entry["status"]
+    if status != 200:
+        return status, headers, body
+
+    etag = _header(headers, 'ETag')
+    last_modified = _header(headers, 'Last-Modified')
+    if_none_match = request.headers.get('If-None-Match')
+    if_modified_since = request.headers.get('If-Modified-Since')
+    if (if_none_match and etag and if_none_match == etag) or \
+            (not if_none_match and if_modified_since and last_modified and if_modified_since == last_modified):
+        return 304, headers, b''
+
+    range_header = request.headers.get('Range', '')
+    if_range = request.headers.get('If-Range')
+    if range_header.startswith('bytes=') and (if_range is None or if_range in (etag, last_modified)):
+        start = range_header[len('bytes='):].split('-', 1)[0]
+        if start.isdigit():
+            start = int(start)
+            if start >= len(body):
+                headers['Content-Range'] = f"bytes */{len(body)}"
+                return 416, headers, b''
+            headers['Content-Range'] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+            return 206, headers, body[start:]
+
+    return 200, headers, body
+
+class CassetteAdapter(HTTPAdapter):
+    """Transport adapter that records to or replays from a Cassette."""
+
+    def __init__(self, cassette, mode='replay', latency=DEFAULT_LATENCY, jitter=0.0, **kwargs):
+        if mode not in MODES:
+            raise ValueError(f"cassette mode must be one of {MODES}, not {mode!r}")
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        super().__init__(**kwargs)
+
+    def _record(self, request, **kwargs):
+        """
+        Fetch the full, unconditional response from the network and store it.
+        Server errors and throttling responses (rate_limit.THROTTLE_STATUSES)
+        are passed through but not recorded, since they are transient and
+        replaying them would keep the retry loop failing. Returns (entry, body).
+        """
+        plain = request.copy()
+        for name in CONDITIONAL_HEADERS:
+            plain.headers.pop(name, None)
+        response = super().send(plain, stream=False, **kwargs)
+        body = response.content
+        if response.status_code >= 500 or response.status_code in rate_limit.THROTTLE_STATUSES:
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS}
+            return {"status": response.status_code, "headers": headers}, body
+        return self.cassette.add(request.method, request.url, response.status_code,
+                                 dict(response.headers), body), body
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        entry = self.cassette.get(request.method, request.url)
+        if entry is None:
+            if self.mode != 'record':
+                raise requests.ConnectionError(f"{request.method} {request.url} is not in cassette {self.cassette.path}",
+                                               request=request)
+            entry, body = self._record(request, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        else:
+            if self.mode == 'replay' and (self.latency or self.jitter):
+                time.sleep(self.latency + random.uniform(0, self.jitter))
+            body = self.cassette.body(entry)
+
+        status, headers, body = _answer(request, entry, body)
+        headers['Content-Length'] = str(len(body))
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status,
+                           preload_content=False, decode_content=False, request_method=request.method)
+        return self.build_response(request, raw)
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+def active():
+    """True if a cassette has been selected."""
+    return bool(_config["path"])
+
+def make_adapter(**kwargs):
+    """Build the adapter for the selected cassette (one Cassette object per path)."""
+    path = str(Path(_config["path"]).resolve())
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+    return CassetteAdapter(_cassettes[path], _config["mode"], _config["latency"], _config["jitter"], **kwargs)
+
+def use(path, mode='replay', latency=DEFAULT_LATENCY, jitter=0.0):
+    """Route the shared HTTP session through a cassette (path=None turns it off)."""
+    import http_client
+    _config.update(path=path, mode=mode, latency=latency, jitter=jitter)
+    http_client.configure()
+
+def cassette_info(path):
+    """Summary of a cassette: interaction count, body bytes and on-disk size."""
+    cassette = Cassette(path)
+    body_bytes = sum(entry.get("size", 0) for entry in cassette.entries.values())
+    stored = sum(p.stat().st_size for p in cassette.bodies_dir.glob("*.gz")) if cassette.bodies_dir.exists() else 0
+    hosts = {}
+    for method, url in cassette.entries:
+        host = requests.utils.urlparse(url).netloc
+        hosts[host] = hosts.get(host, 0) + 1
+    return {"interactions": len(cassette.entries), "body_bytes": body_bytes, "stored_bytes": stored, "hosts": hosts}
+
+def run_script(mode, path, script_args, latency=DEFAULT_LATENCY, jitter=0.0):
+    """Run a scraper script with the cassette selected. Returns (exit code, wall seconds)."""
+    env = dict(os.environ,
+               SCRAPER_CASSETTE=str(path),
+               SCRAPER_CASSETTE_MODE=mode,
+               SCRAPER_REPLAY_LATENCY=str(latency),
+               SCRAPER_REPLAY_JITTER=str(jitter))
+    start = time.perf_counter()
+    code = subprocess.call([sys.executable] + list(script_args), env=env)
+    return code, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay scraper HTTP traffic")
+    sub = parser.add_subparsers(dest='command', required=True)
+    for mode in MODES:
+        cmd = sub.add_parser(mode, help=f"Run a scraper in {mode} mode")
+        cmd.add_argument('cassette', help="Cassette directory")
+        if mode == 'replay':
+            cmd.add_argument('--latency', type=float, default=DEFAULT_LATENCY,
+                             help="Seconds added to every response")
+            cmd.add_argument('--jitter', type=float, default=0.0,
+                             help="Extra random delay of up to this many seconds")
+        # Options go before the cassette; everything after it is passed to the script
+        cmd.add_argument('script', nargs=argparse.REMAINDER, help="Script and its arguments")
+    info = sub.add_parser('info', help="Summarise a cassette")
+    info.add_argument('cassette', help="Cassette directory")
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        report = cassette_info(args.cassette)
+        print(f"Cassette: {args.cassette}")
+        print(f"  Interactions: {report['interactions']}")
+        print(f"  Body bytes: {report['body_bytes']:,} ({report['stored_bytes']:,} on disk)")
+        for host, count in sorted(report['hosts'].items()):
+            print(f"  {host}: {count}")
+        return
+
+    if not args.script:
+        parser.error("give the script to run, e.g. scrape_all_projects_final.py")
+    code, seconds = run_script(args.command, args.cassette, args.script,
+                               getattr(args, 'latency', DEFAULT_LATENCY), getattr(args, 'jitter', 0.0))
+    print(f"\n[{args.command}] {' '.join(args.script)} finished in {seconds:.2f}s (exit {code})")
+    sys.exit(code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for all scrapers: one keep-alive connection pool per host,
+retry/backoff, adaptive per-host rate limiting (rate_limit.py), a common user
+agent and connection reuse reporting.
+
+Image downloads are streamed to disk in BUFFER_SIZE chunks and hashed as the
+bytes arrive, so memory per download stays constant whatever the image size.
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urljoin, urlparse
+
+import image_store
+import http_cassette
+import rate_limit
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+HEADERS = {'User-Agent': USER_AGENT}
+TIMEOUT = 30
+
+# Connection pool settings
+POOL_HOSTS = 10  # Number of per-host pools kept alive
+POOL_SIZE = 10  # Keep-alive connections per host
+
+# Retry settings
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5  # Sleeps 0.5s, 1s, 2s between retries
+RETRY_STATUSES = (500, 502, 504)  # 429/503 are retried through the rate limiter
+
+# Streaming settings
+BUFFER_SIZE = 64 * 1024  # Bytes read from the socket and written to disk at a time
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.webp', '.gif']
+
+_session = None
+_session_lock = threading.Lock()
+_settings = {
+    "pool_hosts": POOL_HOSTS,
+    "pool_size": POOL_SIZE,
+    "max_retries": MAX_RETRIES,
+    "backoff_factor": BACKOFF_FACTOR,
+    "buffer_size": BUFFER_SIZE,
+}
+
+def configure(pool_hosts=None, pool_size=None, max_retries=None, backoff_factor=None, buffer_size=None):
+    """Change pool/retry/streaming settings. Takes effect on the next request."""
+    global _session
+    with _session_lock:
+        for key, value in (("pool_hosts", pool_hosts), ("pool_size", pool_size),
+                           ("max_retries", max_retries), ("backoff_factor", backoff_factor),
+                           ("buffer_size", buffer_size)):
+            if value is not None:
+                _settings[key] = value
+        if _session is not None:
+            _session.close()
+            _session = None
+
+class RateLimitedSession(requests.Session):
+    """
+    Session whose requests each take a token from the host's bucket first.
+    Throttling answers (429/503) slow the host down and are retried once
+    the limiter lets the host through again.
+    """
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        retries = _settings["max_retries"]
+        for attempt in range(retries + 1):
+            rate_limit.limiter.acquire(host)
+            response = super().send(request, **kwargs)
+            retry_after = rate_limit.retry_after_seconds(response.headers.get('Retry-After'))
+            rate_limit.limiter.record(host, response.status_code, retry_after)
+            if response.status_code not in rate_limit.THROTTLE_STATUSES or attempt == retries:
+                return response
+            response.close()
+
+def _build_session():
+    """Create a session with pooled, retrying adapters."""
+    retry = Retry(
+        total=_settings["max_retries"],
+        backoff_factor=_settings["backoff_factor"],
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter_options = dict(
+        pool_connections=_settings["pool_hosts"],
+        pool_maxsize=_settings["pool_size"],
+        max_retries=retry,
+    )
+    if http_cassette.active():
+        # Record/replay through a cassette instead of going straight to the network
+        adapter = http_cassette.make_adapter(**adapter_options)
+    else:
+        adapter = HTTPAdapter(**adapter_options)
+    session = RateLimitedSession()
+    session.headers.update(HEADERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def get_session():
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+def get(url, stream=False, timeout=TIMEOUT, **kwargs):
+    """GET a URL through the shared pool and raise on HTTP errors."""
+    response = get_session().get(url, stream=stream, timeout=timeout, **kwargs)
+    response.raise_for_status()
+    return response
+
+def _guess_extension(url, content_type, default_ext):
+    """Pick a file extension from the URL, falling back to the content type."""
+    ext = os.path.splitext(urlparse(url).path)[1]
+    if ext and ext in IMAGE_EXTENSIONS:
+        return ext
+    if 'jpeg' in content_type or 'jpg' in content_type:
+        return '.jpg'
+    if 'png' in content_type:
+        return '.png'
+    if 'webp' in content_type:
+        return '.webp'
+    return default_ext
+
+class IncompleteDownload(Exception):
+    """A download ended before the advertised number of bytes arrived."""
+
+def _load_part_meta(meta_path, url):
+    """Load validators saved alongside a partial download."""
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("url") == url else None
+
+def _save_part_meta(meta_path, url, response):
+    """Remember the validators of the response a .part file came from."""
+    meta = {
+        "url": url,
+        "etag": response.headers.get('ETag'),
+        "last_modified": response.headers.get('Last-Modified'),
+        "content_type": response.headers.get('Content-Type', ''),
+    }
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    return meta
+
+def _content_range(response):
+    """Parse a Content-Range header into (start, total); missing parts are None."""
+    match = re.match(r'bytes\s+(\d+|\*)(?:-\d+)?/(\d+|\*)', response.headers.get('Content-Range', ''))
+    if not match:
+        return None, None
+    start = int(match.group(1)) if match.group(1) != '*' else None
+    total = int(match.group(2)) if match.group(2) != '*' else None
+    return start, total
+
+def _hash_prefix(path, buffer_size):
+    """SHA-256 object primed with the bytes already in a partial file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(buffer_size), b''):
+            digest.update(chunk)
+    return digest
+
+def _fetch_to_part(url, part_path):
+    """
+    Download url into part_path, resuming an existing partial file with a
+    Range request when the server allows it. Bytes are hashed as they are
+    written. Returns (metadata, sha256 hex digest) once the file is complete
+    and matches the advertised length.
+    """
+    meta_path = f"{part_path}.json"
+    buffer_size = _settings["buffer_size"]
+    last_error = None
+
+    for _ in range(MAX_RETRIES + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        meta = _load_part_meta(meta_path, url) if offset else None
+        validator = meta and (meta.get("etag") or meta.get("last_modified"))
+
+        headers = {'Accept-Encoding': 'identity'}
+        if offset and validator and not validator.startswith('W/'):
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = validator
+        elif offset:
+            # Partial file we can't prove is the same resource: start over
+            os.remove(part_path)
+            offset = 0
+
+        try:
+            response = get_session().get(url, headers=headers, stream=True, timeout=TIMEOUT)
+
+            if response.status_code == 416 and 'Range' in headers:
+                # Nothing left to fetch if the partial file already has every byte
+                _, total = _content_range(response)
+                response.close()
+                if total == offset:
+                    return meta, _hash_prefix(part_path, buffer_size).hexdigest()
+                os.remove(part_path)
+                continue
+
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                start, total = _content_range(response)
+                if start != offset:
+                    response.close()
+                    os.remove(part_path)
+                    continue
+                mode = 'ab'
+                digest = _hash_prefix(part_path, buffer_size)
+            else:
+                # Full response: the server ignored the range or the resource changed
+                total = response.headers.get('Content-Length')
+                total = int(total) if total is not None else None
+                mode = 'wb'
+                meta = _save_part_meta(meta_path, url, response)
+                digest = hashlib.sha256()
+
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=buffer_size):
+                    f.write(chunk)
+                    digest.update(chunk)
+
+            size = os.path.getsize(part_path)
+            if total is not None and size != total:
+                raise IncompleteDownload(f"incomplete download: {size:,} of {total:,} bytes")
+            return meta, digest.hexdigest()
+        except requests.HTTPError:
+            raise
+        except (requests.RequestException, IncompleteDownload) as e:
+            # Keep the .part file and resume from where it stopped
+            last_error = e
+
+    raise last_error
+
+def download_image(url, filepath, base_url=None, default_ext='.png', fix_extension=True):
+    """
+    Download an image from URL to filepath.
+    Bytes are streamed and hashed into a .part file that is resumed with Range requests
+    after interruptions and verified against the expected length. Only then
+    is it moved into the content-addressed image store, and filepath is
+    atomically replaced by a link to the stored blob, so identical images
+    are only kept once and truncated files never appear at final paths.
+    Returns the final file path (the extension may be corrected) or None on failure.
+    """
+    try:
+        if not url.startswith('http'):
+            url = urljoin(base_url or url, url)
+
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        part_path = f"{filepath}.part"
+
+        meta, digest = _fetch_to_part(url, part_path)
+
+        if fix_extension:
+            ext = _guess_extension(url, meta.get("content_type", ''), default_ext)
+            if not filepath.endswith(ext):
+                filepath = os.path.splitext(filepath)[0] + ext
+
+        image_store.ingest(part_path, filepath, digest=digest)
+        if os.path.exists(f"{part_path}.json"):
+            os.remove(f"{part_path}.json")
+
+        file_size = os.path.getsize(filepath)
+        print(f"    [OK] {os.path.basename(filepath)} ({file_size:,} bytes, {digest[:12]})")
+        return filepath
+    except Exception as e:
+        print(f"    [ERROR] {url}: {e}")
+        return None
+
+def connection_stats():
+    """Return per-host connection counts: opened vs reused."""
+    stats = {}
+    if _session is None:
+        return stats
+    for adapter in set(_session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host
+            entry = stats.setdefault(host, {"requests": 0, "opened": 0, "reused": 0})
+            entry["requests"] += pool.num_requests
+            entry["opened"] += pool.num_connections
+            entry["reused"] += max(pool.num_requests - pool.num_connections, 0)
+    return stats
+
+def print_connection_stats():
+    """Print a summary of connection reuse and rate limiting per host."""
+    stats = connection_stats()
+    if stats:
+        print("\nConnection pool:")
+        for host, entry in sorted(stats.items()):
+            print(f"  {host}: {entry['requests']} requests, "
+                  f"{entry['opened']} connections opened, {entry['reused']} reused")
+    rate_limit.print_rate_stats()
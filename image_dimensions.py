@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Header-only image dimension scanner.
+
+Reads width, height and format from PNG (IHDR), JPEG (SOFn marker, with
+EXIF orientation applied) and WebP (VP8/VP8L/VP8X) headers without decoding
+any pixels, so the generators can give every <img> its intrinsic
+width/height and the browser can reserve space before the image arrives.
+Most of the images Squarespace served are WebP saved under a .png name.
+
+Results are cached in INDEX_PATH keyed by path and validated against the
+file's mtime and size, so a warm lookup is just a stat(). The format is
+sniffed from the file's signature, not its extension.
+
+Run directly to (re)build the index for public/images:
+    python image_dimensions.py
+"""
+
+import os
+import json
+import time
+import struct
+from pathlib import Path
+
+IMAGES_DIR = Path("public/images")
+INDEX_PATH = Path(".image_dimensions.json")
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# SOF markers carry the frame size; C4 (DHT), C8 (JPG) and CC (DAC) share the range but don't
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers without a length field
+JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+EXIF_ORIENTATION_TAG = 0x0112
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}  # Width and height swap when displayed
+
+def _png_dimensions(head):
+    if len(head) < 24 or head[12:16] != b'IHDR':
+        return None
+    width, height = struct.unpack('>II', head[16:24])
+    return width, height
+
+def _webp_dimensions(head):
+    chunk = head[12:16]
+    if chunk == b'VP8X' and len(head) >= 30:
+        # Canvas size minus one, 24-bit little-endian
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+        return width, height
+    if chunk == b'VP8 ' and len(head) >= 30 and head[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(head) >= 25 and head[20] == 0x2F:
+        bits = int.from_bytes(head[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    return None
+
+def _exif_orientation(segment):
+    """Orientation tag from an APP1 Exif segment body, or None."""
+    if not segment.startswith(b'Exif\x00\x00'):
+        return None
+    tiff = segment[6:]
+    if tiff[:2] == b'II':
+        endian = '<'
+    elif tiff[:2] == b'MM':
+        endian = '>'
+    else:
+        return None
+    try:
+        (ifd_offset,) = struct.unpack(endian + 'I', tiff[4:8])
+        (count,) = struct.unpack(endian + 'H', tiff[ifd_offset:ifd_offset + 2])
+        for i in range(count):
+            entry = ifd_offset + 2 + i * 12
+            tag, _, _ = struct.unpack(endian + 'HHI', tiff[entry:entry + 8])
+            if tag == EXIF_ORIENTATION_TAG:
+                (value,) = struct.unpack(endian + 'H', tiff[entry + 8:entry + 10])
+                return value
+    except struct.error:
+        return None
+    return None
+
+def _jpeg_dimensions(f):
+    """Walk the marker segments up to the first SOFn, skipping everything else."""
+    f.seek(2)
+    orientation = None
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        while marker == b'\xff':  # Fill bytes
+            marker = f.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker == 0xD9:  # EOI before any frame
+            return None
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack('>H', length_bytes)
+        if marker in JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            _, height, width = struct.unpack('>BHH', frame)
+            if orientation in ROTATED_ORIENTATIONS:
+                width, height = height, width
+            return width, height
+        if marker == 0xE1 and orientation is None:
+            orientation = _exif_orientation(f.read(length - 2))
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+
+def read_dimensions(path):
+    """(width, height, format) from a PNG, JPEG or WebP header, or None for anything else."""
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        if head.startswith(PNG_SIGNATURE):
+            size, fmt = _png_dimensions(head), 'png'
+        elif head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            size, fmt = _webp_dimensions(head), 'webp'
+        elif head.startswith(b'\xff\xd8'):
+            size, fmt = _jpeg_dimensions(f), 'jpeg'
+        else:
+            return None
+    return (*size, fmt) if size else None
+
+class DimensionIndex:
+    """Cached dimensions by path, revalidated against each file's mtime and size."""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self.dirty = False
+        self._checked = {}  # Results already validated in this run
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def lookup(self, image_path):
+        """(width, height, format) for an image, or None if it is missing or unreadable."""
+        key = image_path if isinstance(image_path, str) else Path(image_path).as_posix()
+        if key in self._checked:
+            return self._checked[key]
+        self._checked[key] = found = self._validate(key)
+        return found
+
+    def _validate(self, key):
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return None
+        entry = self.entries.get(key)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return tuple(entry[2:]) if entry[2] else None
+        try:
+            found = read_dimensions(key)
+        except OSError:
+            return None
+        self.entries[key] = [stat.st_mtime_ns, stat.st_size, *(found or (None, None, None))]
+        self.dirty = True
+        return found
+
+    def get(self, image_path):
+        """(width, height) for an image, or None."""
+        found = self.lookup(image_path)
+        return found[:2] if found else None
+
+    def scan(self, root=IMAGES_DIR):
+        """Index every file under root. Returns the number of images found."""
+        found = 0
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if self.lookup(Path(dirpath) / filename):
+                    found += 1
+        return found
+
+    def save(self):
+        """Write the index atomically if anything changed."""
+        if not self.dirty:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+def main():
+    index = DimensionIndex()
+    label = "Cold" if not index.entries else "Refresh"
+    start = time.perf_counter()
+    found = index.scan()
+    print(f"{label} scan: {found} images in {(time.perf_counter() - start) * 1000:.1f} ms")
+    index.save()
+
+    # A fresh index from disk, so the warm pass revalidates by stat instead of hitting _checked
+    start = time.perf_counter()
+    index = DimensionIndex()
+    found = index.scan()
+    print(f"Warm scan: {found} images in {(time.perf_counter() - start) * 1000:.1f} ms (including index load)")
+    print(f"Index: {INDEX_PATH} ({len(index.entries)} files)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Placeholders for project images: a tiny blurred preview (LQIP) as a WebP
+data URI and the dominant colour, for every image in public/images/projects.
+
+The generators embed them as the background of each image's container
+(see responsive_images.placeholder_style), so cards and gallery tiles show
+the image's colours straight away instead of an empty box, with no extra
+requests.
+
+The dominant colour is the mean of the most populated bin of a 16-level
+per-channel colour histogram, computed with NumPy over a 64px thumbnail
+(transparent pixels ignored).
+
+Results are kept in responsive_images.PLACEHOLDERS_PATH, keyed by image path
+with the source SHA-256, so unchanged images are skipped on later runs.
+
+Usage:
+    python image_placeholders.py [--size 16] [--workers N] [--force]
+"""
+
+import io
+import os
+import json
+import base64
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+import image_store
+import responsive_images
+from optimize_images import find_sources
+
+SOURCE_DIR = Path("public/images/projects")
+PLACEHOLDERS_PATH = responsive_images.PLACEHOLDERS_PATH
+
+LQIP_SIZE = 16  # Longest side of the preview, in pixels
+LQIP_BLUR = 1.0  # Gaussian blur radius applied to the preview
+LQIP_QUALITY = 40
+COLOR_SAMPLE = 64  # Longest side of the thumbnail the colour is computed from
+COLOR_BITS = 4  # Histogram levels per channel: 2 ** COLOR_BITS
+
+def dominant_color(image):
+    """Hex colour of the most common colour bin in an RGBA image."""
+    sample = image.copy()
+    sample.thumbnail((COLOR_SAMPLE, COLOR_SAMPLE))
+    pixels = np.asarray(sample, dtype=np.uint8).reshape(-1, 4)
+    opaque = pixels[pixels[:, 3] >= 128]
+    rgb = (opaque if len(opaque) else pixels)[:, :3]
+
+    shift = 8 - COLOR_BITS
+    bins = (rgb >> shift).astype(np.int32)
+    keys = (bins[:, 0] << (2 * COLOR_BITS)) | (bins[:, 1] << COLOR_BITS) | bins[:, 2]
+    top = np.bincount(keys, minlength=1 << (3 * COLOR_BITS)).argmax()
+    r, g, b = rgb[keys == top].mean(axis=0).round().astype(int)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def lqip_data_uri(image, size=LQIP_SIZE):
+    """A blurred size-px preview of the image as a WebP data URI."""
+    preview = image.copy()
+    preview.thumbnail((size, size))
+    preview = preview.filter(ImageFilter.GaussianBlur(LQIP_BLUR))
+    if preview.getextrema()[3][0] == 255:
+        preview = preview.convert('RGB')
+    buffer = io.BytesIO()
+    preview.save(buffer, 'WEBP', quality=LQIP_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+def compute_placeholder(source, size):
+    """Dominant colour and LQIP for one image. Runs in a worker process."""
+    with Image.open(source) as image:
+        # JPEGs can decode straight at a reduced scale
+        image.draft('RGB', (COLOR_SAMPLE * 2, COLOR_SAMPLE * 2))
+        image = image.convert('RGBA')
+        return {"color": dominant_color(image), "lqip": lqip_data_uri(image, size)}
+
+def save_placeholders(placeholders):
+    """Write the placeholder manifest atomically."""
+    PLACEHOLDERS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = PLACEHOLDERS_PATH.with_name(PLACEHOLDERS_PATH.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(placeholders.items())), f, indent=2)
+    os.replace(tmp_path, PLACEHOLDERS_PATH)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute LQIPs and dominant colours for project images")
+    parser.add_argument('--size', type=int, default=LQIP_SIZE,
+                        help=f"Longest side of the preview in pixels (default: {LQIP_SIZE})")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="Recompute even if the image is unchanged")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"Computing placeholders for {SOURCE_DIR}")
+    print("=" * 70)
+
+    placeholders = responsive_images.load_placeholders()
+    sources = find_sources(SOURCE_DIR)
+    present = {source.as_posix() for source in sources}
+    for key in [key for key in placeholders if key not in present]:
+        del placeholders[key]
+
+    jobs = []
+    for source in sources:
+        key = source.as_posix()
+        digest = image_store.hash_file(source)
+        entry = placeholders.get(key)
+        if not args.force and entry and entry.get("sha256") == digest and entry.get("size") == args.size:
+            continue
+        jobs.append((key, digest))
+    print(f"  {len(sources)} images, {len(sources) - len(jobs)} unchanged, {len(jobs)} to compute")
+
+    with ProcessPoolExecutor(args.workers) as pool:
+        futures = {pool.submit(compute_placeholder, key, args.size): (key, digest) for key, digest in jobs}
+        for done, future in enumerate(futures, 1):
+            key, digest = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  [ERROR] {key}: {e}")
+                continue
+            placeholders[key] = {"sha256": digest, "size": args.size, **result}
+            print(f"  [{done}/{len(jobs)}] {key}: {result['color']}, {len(result['lqip'])} byte LQIP")
+
+    save_placeholders(placeholders)
+    print(f"\nSaved {len(placeholders)} placeholders to {PLACEHOLDERS_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Content-addressed image store.
+
+Every downloaded image is hashed (SHA-256) and kept once under STORE_DIR.
+The per-project paths in public/images are hardlinks to those blobs (or plain
+copies where hardlinks aren't supported), and MANIFEST_PATH records the
+path -> hash mapping so byte-identical files are stored and deployed once.
+Blobs are named by digest alone; the extension lives in the manifest's
+paths, so the same bytes saved as .jpg and .png share one blob. Each
+ingest() appends its entry to LOG_PATH instead of rewriting the manifest,
+and save_manifest() folds the log back in, so a scrape costs one line per
+download rather than one full manifest write.
+The manifest is local state like the blobs, so it lives in STORE_DIR rather
+than under the deployed public/ tree.
+Stored paths must never be rewritten in place (open(path, 'wb') would change
+every link to the same blob); write elsewhere and call ingest() instead.
+
+Run directly to migrate the existing image tree into the store:
+    python image_store.py
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+
+IMAGES_DIR = Path("public/images")
+STORE_DIR = Path(".image_store")
+MANIFEST_PATH = STORE_DIR / "manifest.json"
+LOG_PATH = STORE_DIR / "manifest.log"  # JSONL of entries added since the manifest was written
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def blob_path(digest):
+    """Return the store path for a digest."""
+    return STORE_DIR / digest[:2] / digest
+
+def _manifest_key(path):
+    """Manifest keys are repo-relative POSIX paths."""
+    return Path(os.path.relpath(path)).as_posix()
+
+def load_manifest():
+    """Load the path -> hash manifest with the log replayed over it (cached after the first call)."""
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+                _manifest = json.load(f)
+        except (OSError, ValueError):
+            _manifest = {}
+        try:
+            with open(LOG_PATH, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        path, entry = json.loads(line)
+                    except ValueError:
+                        break  # A line cut short by a crash; nothing after it was written
+                    _manifest[path] = entry
+        except OSError:
+            pass
+    return _manifest
+
+def _log_entry(path, entry):
+    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOG_PATH, 'a', encoding='utf-8') as f:
+        f.write(json.dumps([path, entry]) + "\n")
+
+def save_manifest():
+    """Write the manifest atomically, folding in the log."""
+    manifest = load_manifest()
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFEST_PATH.with_name(MANIFEST_PATH.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+    try:
+        os.remove(LOG_PATH)
+    except FileNotFoundError:
+        pass
+
+def _same_file(a, b):
+    """True if both paths exist and are the same inode."""
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+def _materialise(blob, dest_path):
+    """Point dest_path at blob via a hardlink, falling back to a copy."""
+    dest_path = Path(dest_path)
+    if _same_file(blob, dest_path):
+        return
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_path.with_name(f".{dest_path.name}.{os.getpid()}.{threading.get_ident()}.link")
+    try:
+        os.link(blob, tmp_path)
+    except OSError:
+        shutil.copy2(blob, tmp_path)
+    os.replace(tmp_path, dest_path)
+
+def ingest(src_path, dest_path, digest=None, save=True):
+    """
+    Move src_path into the store and materialise it at dest_path.
+    src_path may equal dest_path. Returns the SHA-256 digest. The manifest
+    entry is appended to the log, or with save=False only kept in memory
+    until save_manifest().
+    """
+    src_path = Path(src_path)
+    if digest is None:
+        digest = hash_file(src_path)
+    blob = blob_path(digest)
+
+    if not blob.exists():
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        if src_path == Path(dest_path):
+            # Keep the file in place: the blob becomes a second name for it
+            try:
+                os.link(src_path, blob)
+            except OSError:
+                shutil.copy2(src_path, blob)
+        else:
+            os.replace(src_path, blob)
+    elif src_path != Path(dest_path) and src_path.exists():
+        # Bytes already stored, the fresh copy is redundant
+        src_path.unlink()
+
+    _materialise(blob, dest_path)
+
+    with _manifest_lock:
+        manifest = load_manifest()
+        key = _manifest_key(dest_path)
+        manifest[key] = {
+            "sha256": digest,
+            "size": blob.stat().st_size,
+        }
+        if save:
+            _log_entry(key, manifest[key])
+    return digest
+
+def dedupe_tree(root=IMAGES_DIR):
+    """Migrate every file under root into the store, hardlinking duplicates."""
+    seen = {}
+    total_bytes = 0
+    duplicate_bytes = 0
+    files = 0
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if filename.startswith('.'):
+                continue
+            size = path.stat().st_size
+            digest = hash_file(path)
+            files += 1
+            total_bytes += size
+            if digest in seen:
+                duplicate_bytes += size
+            else:
+                seen[digest] = path
+            ingest(path, path, digest=digest, save=False)
+
+    with _manifest_lock:
+        save_manifest()
+
+    return {
+        "files": files,
+        "unique": len(seen),
+        "total_bytes": total_bytes,
+        "duplicate_bytes": duplicate_bytes,
+    }
+
+def main():
+    """Deduplicate the public image tree."""
+    print("=" * 70)
+    print(f"Deduplicating {IMAGES_DIR} into {STORE_DIR}")
+    print("=" * 70)
+
+    report = dedupe_tree()
+
+    print(f"  Files: {report['files']}")
+    print(f"  Unique blobs: {report['unique']}")
+    print(f"  Total size: {report['total_bytes']:,} bytes")
+    print(f"  Duplicate bytes now stored once: {report['duplicate_bytes']:,} bytes")
+    print(f"  Manifest: {MANIFEST_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Single-pass parser for JavaScript object literals embedded in HTML or
+source files, such as `const projectsRaw = [...];` in data/projects.ts.
+
+The tokenizer understands strings (with escapes), comments, numbers and
+identifiers, so braces inside a description can't unbalance anything.
+Parsing builds a small model where every node keeps its [start, end) span
+in the source text:
+
+    literal = js_literal.find_declaration(html, 'projectShards')
+    prop = literal.value.get('icyveins')        # JSProperty, span covers '"icyveins": "..."'
+    prop.value.to_python()                     # -> Python value
+    html = js_literal.splice(html, [(prop.start, prop.end, new_text)])
+
+splice() applies any number of span replacements in one pass, so updating
+N projects costs O(file) instead of one search per project. to_source()
+goes the other way, writing Python values back out as a literal.
+"""
+
+import re
+import json
+
+class JSParseError(ValueError):
+    """The text is not a JavaScript literal this parser understands."""
+
+# Leading whitespace and comments are consumed by the same match as the token
+_TOKEN = re.compile(r'''
+    (?:\s|//[^\n]*|/\*.*?\*/)*
+    (?:
+      (?P<string>"[^"\\\n]*(?:\\.[^"\\\n]*)*"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'|`[^`\\]*(?:\\.[^`\\]*)*`)
+    | (?P<number>-?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?))
+    | (?P<ident>[A-Za-z_$][\w$]*)
+    | (?P<punct>[{}\[\]:,;])
+    | (?P<end>$)
+    )
+''', re.VERBOSE | re.DOTALL)
+
+_ESCAPE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)', re.DOTALL)
+_SIMPLE_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0',
+                   '\n': '', '\r\n': ''}
+_KEYWORDS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+def _unescape_match(match):
+    escape = match.group(1)
+    if escape[0] in 'ux' and len(escape) > 1:
+        return chr(int(escape.strip('u{}x'), 16))
+    return _SIMPLE_ESCAPES.get(escape, escape)
+
+def unescape_string(raw):
+    """Python value of a quoted JS string token."""
+    return _ESCAPE.sub(_unescape_match, raw[1:-1])
+
+class JSValue:
+    """A string, number or keyword literal."""
+
+    def __init__(self, start, end, raw, value):
+        self.start = start
+        self.end = end
+        self.raw = raw
+        self.value = value
+
+    def to_python(self):
+        return self.value
+
+class JSArray:
+    def __init__(self, start, end, items):
+        self.start = start
+        self.end = end
+        self.items = items
+
+    def to_python(self):
+        return [item.to_python() for item in self.items]
+
+class JSProperty:
+    """key: value. The span runs from the start of the key to the end of the value."""
+
+    def __init__(self, key, start, end, value):
+        self.key = key
+        self.start = start
+        self.end = end
+        self.value = value
+
+class JSObject:
+    def __init__(self, start, end, properties):
+        self.start = start
+        self.end = end
+        self.properties = properties
+        self._by_key = {prop.key: prop for prop in properties}
+
+    def get(self, key):
+        """The JSProperty for key (the last one if repeated), or None."""
+        return self._by_key.get(key)
+
+    def value_of(self, key, default=None):
+        """Python value of a property, or default if it is missing."""
+        prop = self._by_key.get(key)
+        return prop.value.to_python() if prop else default
+
+    def keys(self):
+        return [prop.key for prop in self.properties]
+
+    def to_python(self):
+        return {prop.key: prop.value.to_python() for prop in self.properties}
+
+class JSDeclaration:
+    """`const name = <value>;`: start is the keyword, end is after the semicolon (if any)."""
+
+    def __init__(self, name, start, end, value):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.value = value
+
+def tokenize(text, pos=0):
+    """Yield (kind, raw, start, end) for significant tokens from pos, skipping space and comments."""
+    match_token = _TOKEN.match
+    while True:
+        match = match_token(text, pos)
+        if not match:
+            raise JSParseError(f"unexpected character at offset {pos}")
+        kind = match.lastgroup
+        if kind == 'end':
+            return
+        start = match.start(kind)
+        pos = match.end()
+        yield kind, text[start:pos], start, pos
+
+class _Parser:
+    def __init__(self, text, pos):
+        self.tokens = tokenize(text, pos)
+        self.current = next(self.tokens, None)
+
+    def advance(self):
+        token = self.current
+        if token is None:
+            raise JSParseError("unexpected end of input")
+        self.current = next(self.tokens, None)
+        return token
+
+    def expect(self, raw):
+        token = self.advance()
+        if token[1] != raw:
+            raise JSParseError(f"expected {raw!r} at offset {token[2]}, found {token[1]!r}")
+        return token
+
+    def value(self):
+        kind, raw, start, end = self.advance()
+        if raw == '{':
+            return self.object(start)
+        if raw == '[':
+            return self.array(start)
+        if kind == 'string':
+            if raw[0] == '`' and '${' in raw:
+                raise JSParseError(f"template literal with substitutions at offset {start}")
+            return JSValue(start, end, raw, unescape_string(raw))
+        if kind == 'number':
+            return JSValue(start, end, raw, int(raw, 16) if raw.lower().startswith(('0x', '-0x')) else
+                           (float(raw) if any(c in raw for c in '.eE') else int(raw)))
+        if kind == 'ident' and raw in _KEYWORDS:
+            return JSValue(start, end, raw, _KEYWORDS[raw])
+        raise JSParseError(f"unsupported value {raw!r} at offset {start}")
+
+    def object(self, start):
+        properties = []
+        while True:
+            kind, raw, key_start, key_end = self.advance()
+            if raw == '}':
+                return JSObject(start, key_end, properties)
+            if kind == 'string':
+                key = unescape_string(raw)
+            elif kind in ('ident', 'number'):
+                key = raw
+            else:
+                raise JSParseError(f"expected a property name at offset {key_start}, found {raw!r}")
+            self.expect(':')
+            value = self.value()
+            properties.append(JSProperty(key, key_start, value.end, value))
+            kind, raw, pos, end = self.advance()
+            if raw == '}':
+                return JSObject(start, end, properties)
+            if raw != ',':
+                raise JSParseError(f"expected ',' or '}}' at offset {pos}, found {raw!r}")
+
+    def array(self, start):
+        items = []
+        while True:
+            if self.current is not None and self.current[1] == ']':
+                return JSArray(start, self.advance()[3], items)
+            items.append(self.value())
+            kind, raw, pos, end = self.advance()
+            if raw == ']':
+                return JSArray(start, end, items)
+            if raw != ',':
+                raise JSParseError(f"expected ',' or ']' at offset {pos}, found {raw!r}")
+
+def parse_value(text, pos=0):
+    """Parse the literal starting at pos (after any whitespace)."""
+    return _Parser(text, pos).value()
+
+def find_declaration(text, name):
+    """
+    Parse `const|let|var <name> = <literal>;` in text, allowing a TypeScript
+    annotation (`const name: Type[] = ...`). Returns a JSDeclaration, or
+    None if there is no such declaration.
+    """
+    match = re.search(rf'\b(?:const|let|var)\s+{re.escape(name)}\s*(?::[^=;]+)?=\s*', text)
+    if not match:
+        return None
+    parser = _Parser(text, match.end())
+    value = parser.value()
+    end = value.end
+    if parser.current is not None and parser.current[1] == ';':
+        end = parser.current[3]
+    return JSDeclaration(name, match.start(), end, value)
+
+# Skips ahead to the next string, comment or bracket: the only things that
+# can hide or change bracket depth. A lone '/' (division) is skipped too.
+_BRACKETS = re.compile(r'''
+    [^"'`/{}\[\]]*
+    (?:
+      "[^"\\\n]*(?:\\.[^"\\\n]*)*"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'|`[^`\\]*(?:\\.[^`\\]*)*`
+    | //[^\n]*|/\*.*?\*/
+    | (?P<bracket>[{}\[\]])
+    | /
+    )
+''', re.VERBOSE | re.DOTALL)
+
+def declaration_span(text, name):
+    """
+    (start, value start, value end, end) of the `name` declaration holding
+    an object or array literal, found by matching brackets without building
+    any nodes, or None if there is no such declaration. Use it when only
+    the span is needed, e.g. to replace the whole literal.
+    """
+    match = re.search(rf'\b(?:const|let|var)\s+{re.escape(name)}\s*(?::[^=;]+)?=\s*', text)
+    if not match or text[match.end():match.end() + 1] not in ('{', '['):
+        return None
+    depth = 0
+    pos = match.end()
+    match_token = _BRACKETS.match
+    while True:
+        token = match_token(text, pos)
+        if token is None:  # Out of text, or an unterminated string or comment
+            raise JSParseError(f"unbalanced brackets in the `{name}` declaration")
+        pos = token.end()
+        bracket = token.group('bracket')
+        if bracket is None:
+            continue
+        if bracket in '{[':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                end = pos + 1 if text[pos:pos + 1] == ';' else pos
+                return match.start(), match.end(), pos, end
+
+def splice(text, replacements):
+    """
+    Apply (start, end, new_text) replacements to text in one pass.
+    Spans must not overlap.
+    """
+    pieces = []
+    pos = 0
+    for start, end, new_text in sorted(replacements, key=lambda r: (r[0], r[1])):
+        if start < pos:
+            raise ValueError(f"overlapping replacement at offset {start}")
+        pieces.append(text[pos:start])
+        pieces.append(new_text)
+        pos = end
+    pieces.append(text[pos:])
+    return ''.join(pieces)
+
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*\Z')
+
+_encode_string = json.encoder.encode_basestring  # json.dumps(s, ensure_ascii=False) without the overhead
+
+def _scalar_source(value):
+    if isinstance(value, str):
+        return _encode_string(value)
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return repr(value)
+
+def _key_source(key):
+    return key if _IDENTIFIER.match(key) else _encode_string(key)
+
+def to_source(value, indent='', step='  ', width=100, inline_objects=False, prefix=0):
+    """
+    JavaScript source for a Python value (dicts, lists, strings, numbers,
+    booleans, None), as written by hand: identifier keys unquoted, one item
+    per line with trailing commas. Lists of scalars stay on one line when
+    they fit in width (counting indent and prefix, the text before the
+    value on its line); so do scalar-only objects if inline_objects.
+    """
+    if isinstance(value, dict):
+        labels = [f'{_key_source(key)}: ' for key in value]
+        items = list(value.values())
+        opener, closer = '{', '}'
+    elif isinstance(value, list):
+        labels = None
+        items = value
+        opener, closer = '[', ']'
+    else:
+        return _scalar_source(value)
+    if not items:
+        return opener + closer
+
+    inner = indent + step
+    if any(isinstance(item, (dict, list)) for item in items):
+        if labels:
+            sources = [label + to_source(item, inner, step, width, inline_objects, len(label))
+                       for label, item in zip(labels, items)]
+        else:
+            sources = [to_source(item, inner, step, width, inline_objects) for item in items]
+    else:
+        sources = [_scalar_source(item) for item in items]
+        if labels:
+            sources = [label + source for label, source in zip(labels, sources)]
+        if inline_objects or not labels:
+            inline = f'{{ {", ".join(sources)} }}' if labels else f'[{", ".join(sources)}]'
+            if len(indent) + prefix + len(inline) + 1 <= width:
+                return inline
+    return f'{opener}\n{inner}' + f',\n{inner}'.join(sources) + f',\n{indent}{closer}'
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash near-duplicate detection for public/images/projects.
+
+image_store.py already stores byte-identical files once; this finds images
+that look the same but differ in bytes: re-encodings, resizes and the
+slightly different exports Squarespace keeps per page.
+
+Each image gets two 64-bit hashes, computed with NumPy over the whole set
+at once:
+  pHash - signs of the lowest 8x8 DCT coefficients of a 32x32 greyscale
+          thumbnail, relative to their median
+  dHash - whether each pixel of a 9x8 thumbnail is brighter than its
+          right-hand neighbour
+Hashes go into a BK-tree, and every image is queried for neighbours within
+--threshold bits of pHash Hamming distance (confirmed by dHash within
+DHASH_THRESHOLD). Matches are merged into clusters, and the canonical file of
+each cluster is the one with the most pixels, then the most bytes.
+
+Hashes alone also match different states of the same UI screen (a tab
+selected, a banner changed), so each pair is checked pixel by pixel on
+256px thumbnails too. Only members that never differ by more than
+TILE_THRESHOLD in any 16px tile count as the same image; --rewrite replaces
+only those and keeps the merely similar ones.
+
+Hashes are cached in HASH_CACHE_PATH by path, mtime and size, so only new or
+changed images are decoded on later runs.
+
+Usage:
+    python near_duplicates.py [--threshold 6] [--workers N]
+    python near_duplicates.py --rewrite   # point all_projects_scraped.json at the canonical files
+"""
+
+import os
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+import project_stream
+from image_dimensions import DimensionIndex
+from optimize_images import find_sources
+
+SOURCE_DIR = Path("public/images/projects")
+HASH_CACHE_PATH = Path(".perceptual_hashes.json")
+REPORT_PATH = Path("near_duplicates_report.json")
+
+HASH_SIZE = 8  # Hashes are HASH_SIZE x HASH_SIZE bits
+PHASH_SAMPLE = 32  # Side of the thumbnail the DCT runs over
+PHASH_THRESHOLD = 6  # Max differing pHash bits for a near-duplicate
+DHASH_THRESHOLD = 10  # Max differing dHash bits to confirm it
+VERIFY_SAMPLE = 256  # Side of the thumbnails compared pixel by pixel
+VERIFY_TILE = 16
+TILE_THRESHOLD = 6.0  # Max mean grey-level difference in any tile for "same image"
+
+def _dct_matrix(n):
+    """Orthonormal DCT-II basis, so dct(x) = D @ x @ D.T."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+def load_thumbnails(path):
+    """
+    Greyscale thumbnails of one image for hashing: (32x32 for pHash, 9x8
+    for dHash) as float32 arrays. Runs in a worker process.
+    """
+    with Image.open(path) as image:
+        image.draft('L', (PHASH_SAMPLE * 4, PHASH_SAMPLE * 4))
+        if image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info):
+            # Transparent areas count as white rather than whatever colour they hide
+            rgba = image.convert('RGBA')
+            image = Image.new('RGBA', rgba.size, 'white')
+            image.alpha_composite(rgba)
+        grey = image.convert('L')
+        sample = grey.resize((PHASH_SAMPLE, PHASH_SAMPLE), Image.LANCZOS)
+        gradient = grey.resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+    return np.asarray(sample, dtype=np.float32), np.asarray(gradient, dtype=np.float32)
+
+def _pack(bits):
+    """(N, 64) booleans -> N Python ints."""
+    packed = np.packbits(bits.reshape(len(bits), -1), axis=1)
+    return [int.from_bytes(row.tobytes(), 'big') for row in packed]
+
+def perceptual_hashes(samples, gradients):
+    """pHash and dHash for a batch of thumbnails: (N,32,32) and (N,8,9) -> two lists of ints."""
+    dct = _dct_matrix(PHASH_SAMPLE)
+    coefficients = np.einsum('ij,njk,lk->nil', dct, samples, dct)[:, :HASH_SIZE, :HASH_SIZE]
+    flat = coefficients.reshape(len(coefficients), -1)
+    # The DC term only measures overall brightness, so it is left out of the median
+    medians = np.median(flat[:, 1:], axis=1, keepdims=True)
+    phashes = _pack(flat > medians)
+    dhashes = _pack(gradients[:, :, 1:] > gradients[:, :, :-1])
+    return phashes, dhashes
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+class BKTree:
+    """Burkhard-Keller tree over integer hashes with Hamming distance."""
+
+    def __init__(self):
+        self.root = None  # [hash, [items], {distance: child}]
+
+    def add(self, value, item):
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def query(self, value, radius):
+        """Yield (distance, item) for every stored hash within radius of value."""
+        if self.root is None:
+            return
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                for item in node[1]:
+                    yield distance, item
+            # Triangle inequality: only children in this band can be within radius
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+
+def load_cache():
+    try:
+        with open(HASH_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    tmp_path = HASH_CACHE_PATH.with_name(HASH_CACHE_PATH.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, HASH_CACHE_PATH)
+
+def hash_images(sources, workers=None):
+    """{path: (phash, dhash)} for every source, decoding only uncached images."""
+    cache = load_cache()
+    hashes = {}
+    stale = []
+    for source in sources:
+        key = source.as_posix()
+        stat = source.stat()
+        entry = cache.get(key)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            hashes[key] = (int(entry[2], 16), int(entry[3], 16))
+        else:
+            stale.append((key, stat))
+    print(f"  {len(sources)} images, {len(sources) - len(stale)} cached, {len(stale)} to hash")
+
+    if stale:
+        keys = []
+        samples, gradients = [], []
+        with ProcessPoolExecutor(workers) as pool:
+            for (key, stat), result in zip(stale, pool.map(_try_thumbnails, [key for key, _ in stale])):
+                if result is None:
+                    print(f"  [SKIP] {key}: not a readable image")
+                    continue
+                keys.append((key, stat))
+                samples.append(result[0])
+                gradients.append(result[1])
+        if keys:
+            phashes, dhashes = perceptual_hashes(np.stack(samples), np.stack(gradients))
+            for (key, stat), phash, dhash in zip(keys, phashes, dhashes):
+                hashes[key] = (phash, dhash)
+                cache[key] = [stat.st_mtime_ns, stat.st_size, f"{phash:016x}", f"{dhash:016x}"]
+
+    present = {source.as_posix() for source in sources}
+    save_cache({key: entry for key, entry in cache.items() if key in present})
+    return hashes
+
+def _try_thumbnails(path):
+    try:
+        return load_thumbnails(path)
+    except (OSError, ValueError):
+        return None
+
+def find_pairs(hashes, threshold=PHASH_THRESHOLD, dhash_threshold=DHASH_THRESHOLD):
+    """{(path, other): pHash distance} for every near-duplicate pair, path < other."""
+    tree = BKTree()
+    for path, (phash, _) in hashes.items():
+        tree.add(phash, path)
+    pairs = {}
+    for path, (phash, dhash) in hashes.items():
+        for distance, other in tree.query(phash, threshold):
+            if other > path and hamming(dhash, hashes[other][1]) <= dhash_threshold:
+                pairs[(path, other)] = distance
+    return pairs
+
+def clusters_from_pairs(pairs):
+    """Connected groups of paths (union-find), each sorted, largest-first order not implied."""
+    parent = {}
+
+    def find(path):
+        parent.setdefault(path, path)
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    for a, b in pairs:
+        parent[find(b)] = find(a)
+    groups = {}
+    for path in list(parent):
+        groups.setdefault(find(path), []).append(path)
+    return sorted(sorted(members) for members in groups.values())
+
+def load_verify_sample(path):
+    """256x256 greyscale thumbnail for pixel comparison. Runs in a worker process."""
+    with Image.open(path) as image:
+        image.draft('L', (VERIFY_SAMPLE * 2, VERIFY_SAMPLE * 2))
+        if image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info):
+            rgba = image.convert('RGBA')
+            image = Image.new('RGBA', rgba.size, 'white')
+            image.alpha_composite(rgba)
+        sample = image.convert('L').resize((VERIFY_SAMPLE, VERIFY_SAMPLE), Image.BOX)
+    return np.asarray(sample, dtype=np.float32)
+
+def tile_differences(pairs, workers=None):
+    """
+    {pair: largest mean absolute difference over any VERIFY_TILE-pixel tile}.
+    Re-encodings and resizes differ a little everywhere; different UI states
+    of one screen differ a lot in one place, which a whole-image hash misses.
+    """
+    paths = sorted({path for pair in pairs for path in pair})
+    with ProcessPoolExecutor(workers) as pool:
+        samples = dict(zip(paths, pool.map(load_verify_sample, paths)))
+    tiles = VERIFY_SAMPLE // VERIFY_TILE
+    differences = {}
+    for a, b in pairs:
+        diff = np.abs(samples[a] - samples[b]).reshape(tiles, VERIFY_TILE, tiles, VERIFY_TILE)
+        differences[(a, b)] = float(diff.mean(axis=(1, 3)).max())
+    return differences
+
+def choose_canonical(members, dimensions):
+    """The member with the most pixels, then the most bytes, then the first path."""
+    def rank(path):
+        size = dimensions.get(path) or (0, 0)
+        return (-size[0] * size[1], -os.path.getsize(path), path)
+    return min(members, key=rank)
+
+def build_report(pairs, differences, dimensions, tile_threshold=TILE_THRESHOLD):
+    """
+    One entry per near-duplicate cluster. "same_as_canonical" lists the
+    members that also passed the pixel check (the only ones --rewrite
+    replaces); "similar" lists the rest.
+    """
+    verified = [pair for pair in pairs if differences[pair] <= tile_threshold]
+    same_group = {}
+    for members in clusters_from_pairs(verified):
+        for path in members:
+            same_group[path] = members
+
+    report = []
+    for members in clusters_from_pairs(pairs):
+        canonical = choose_canonical(members, dimensions)
+        canonical_group = same_group.get(canonical, [canonical])
+        report.append({
+            "canonical": canonical,
+            "same_as_canonical": [path for path in canonical_group if path != canonical],
+            "similar": [path for path in members if path not in canonical_group],
+            "pairs": [{"a": a, "b": b, "phash_distance": pairs[(a, b)], "tile_difference": round(differences[(a, b)], 2)}
+                      for a, b in sorted(pairs) if a in members],
+            "bytes": sum(os.path.getsize(path) for path in canonical_group if path != canonical),
+        })
+    return report
+
+def rewrite_references(report, json_path=project_stream.JSON_PATH):
+    """
+    Point every image reference in the scraped JSON at its canonical file,
+    for members that passed the pixel check, dropping repeats within a list.
+    Returns the number of references changed.
+    """
+    canonical = {path: cluster["canonical"] for cluster in report for path in cluster["same_as_canonical"]}
+    projects = dict(project_stream.iter_projects(json_path=json_path))
+    changed = 0
+    for project in projects.values():
+        images = project.get("images", {})
+        for key, value in images.items():
+            if isinstance(value, str) and value in canonical:
+                images[key] = canonical[value]
+                changed += 1
+            elif isinstance(value, list):
+                rewritten = [canonical.get(path, path) for path in value]
+                changed += sum(1 for old, new in zip(value, rewritten) if old != new)
+                images[key] = list(dict.fromkeys(rewritten))
+
+    json_path = Path(json_path)
+    tmp_path = json_path.with_name(json_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(projects, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, json_path)
+    return changed
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate project images")
+    parser.add_argument('--threshold', type=int, default=PHASH_THRESHOLD,
+                        help=f"Max differing pHash bits (default: {PHASH_THRESHOLD})")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--rewrite', action='store_true',
+                        help=f"Rewrite references in {project_stream.JSON_PATH} to the canonical files")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"Finding near-duplicates in {SOURCE_DIR}")
+    print("=" * 70)
+
+    hashes = hash_images(find_sources(SOURCE_DIR), args.workers)
+    pairs = find_pairs(hashes, args.threshold)
+    differences = tile_differences(pairs, args.workers)
+    dimensions = DimensionIndex()
+    report = build_report(pairs, differences, dimensions)
+    dimensions.save()
+
+    for cluster in report:
+        print(f"\n  {cluster['canonical']}")
+        for path in cluster['same_as_canonical']:
+            print(f"    = {path}")
+        for path in cluster['similar']:
+            print(f"    ~ {path}")
+    same = sum(len(cluster['same_as_canonical']) for cluster in report)
+    similar = sum(len(cluster['similar']) for cluster in report)
+    print(f"\n  {len(report)} clusters: {same} duplicates of their canonical file "
+          f"({sum(cluster['bytes'] for cluster in report):,} bytes), {similar} similar but different")
+    print("  (= same image, replaced by --rewrite; ~ looks alike but differs somewhere, kept)")
+
+    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"  Report: {REPORT_PATH}")
+
+    if args.rewrite:
+        changed = rewrite_references(report)
+        print(f"  Rewrote {changed} references in {project_stream.JSON_PATH}")
+
+if __name__ == "__main__":
+    main()
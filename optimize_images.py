@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Post-download image optimisation: writes WebP (and AVIF, when Pillow
+supports it) derivatives of every PNG/JPEG under public/images.
+
+Derivatives mirror the source tree under public/images/optimized, e.g.
+    public/images/projects/icyveins/hero.png
+ -> public/images/optimized/projects/icyveins/hero.webp / hero.avif
+plus a width ladder (responsive_images.WIDTHS) for srcset:
+ -> public/images/optimized/projects/icyveins/hero-400w.webp, hero-800w.webp, ...
+
+Work is spread over a process pool. A manifest records each source's
+SHA-256 and the settings used, so unchanged images are skipped on later
+runs. A derivative that would be no smaller than its source is not kept.
+A per-project size report is printed and saved to REPORT_PATH.
+
+Usage:
+    python optimize_images.py [--formats webp avif] [--webp-quality 80]
+                              [--avif-quality 50] [--widths 400 800 1200 1600]
+                              [--workers N] [--force]
+"""
+
+import os
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, features
+
+import image_store
+import responsive_images
+
+SOURCE_DIR = Path("public/images")
+OPTIMIZED_DIR = SOURCE_DIR / "optimized"
+MANIFEST_PATH = responsive_images.MANIFEST_PATH
+REPORT_PATH = Path("image_size_report.json")
+
+SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+WEBP_QUALITY = 80
+AVIF_QUALITY = 50
+WEBP_METHOD = 4  # 0 (fast) .. 6 (smallest)
+
+def avif_supported():
+    """True if this Pillow build can write AVIF."""
+    try:
+        return features.check('avif')
+    except ValueError:
+        # Older Pillow without the feature flag; the plugin registers the format
+        try:
+            import pillow_avif  # noqa: F401
+        except ImportError:
+            return False
+        return 'AVIF' in Image.SAVE
+
+def default_formats():
+    return ['webp', 'avif'] if avif_supported() else ['webp']
+
+def find_sources(root=SOURCE_DIR):
+    """PNG/JPEG files under root, excluding the derivatives tree."""
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if Path(dirpath) / d != OPTIMIZED_DIR)
+        for filename in sorted(filenames):
+            if filename.lower().endswith(SOURCE_EXTENSIONS) and not filename.startswith('.'):
+                sources.append(Path(dirpath) / filename)
+    return sources
+
+def derivative_base(source, taken):
+    """
+    Path (without extension) of a source's derivatives. Sources that would
+    collide (hero.png and hero.jpg) keep their extension in the name.
+    """
+    rel = source.relative_to(SOURCE_DIR)
+    base = OPTIMIZED_DIR / rel.parent / rel.stem
+    if base in taken:
+        base = OPTIMIZED_DIR / rel.parent / f"{rel.stem}-{rel.suffix.lstrip('.').lower()}"
+    taken.add(base)
+    return base
+
+def _prepare(image):
+    """Convert to a mode WebP/AVIF encoders accept, keeping transparency."""
+    if image.mode in ('RGB', 'RGBA'):
+        return image
+    if image.mode in ('P', 'LA', 'PA') or 'transparency' in image.info:
+        return image.convert('RGBA')
+    return image.convert('RGB')
+
+def _encode(image, path, fmt, settings):
+    """Write one derivative. Returns the byte size."""
+    if fmt == 'webp':
+        return _save_atomic(image, path, 'WEBP', quality=settings["webp_quality"], method=WEBP_METHOD)
+    return _save_atomic(image, path, 'AVIF', quality=settings["avif_quality"])
+
+def _save_atomic(image, path, fmt, **options):
+    """Encode to a temp file and move it into place. Returns the byte size."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    image.save(tmp_path, fmt, **options)
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+def optimise_one(source, base, formats, settings):
+    """
+    Encode one source into each format, full size and at each ladder width
+    narrower than the source. Runs in a worker process. Returns
+    {"width", "height", "outputs": {format: {"path", "bytes"} or {"skipped", "bytes"}},
+     "ladder": {format: {width: path}}}.
+    """
+    source = Path(source)
+    source_bytes = source.stat().st_size
+    outputs = {}
+    ladder = {fmt: {} for fmt in formats}
+    with Image.open(source) as image:
+        image = _prepare(image)
+        width, height = image.size
+        for fmt in formats:
+            path = Path(f"{base}.{fmt}")
+            size = _encode(image, path, fmt, settings)
+            if size >= source_bytes:
+                path.unlink()
+                outputs[fmt] = {"skipped": "not smaller than source", "bytes": size}
+            else:
+                outputs[fmt] = {"path": path.as_posix(), "bytes": size}
+        for target in settings["widths"]:
+            if target >= width:
+                continue
+            resized = image.resize((target, max(1, round(height * target / width))), Image.LANCZOS)
+            for fmt in formats:
+                path = Path(f"{base}-{target}w.{fmt}")
+                _encode(resized, path, fmt, settings)
+                ladder[fmt][str(target)] = path.as_posix()
+    return {"width": width, "height": height, "outputs": outputs, "ladder": ladder}
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    """Write the manifest atomically."""
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFEST_PATH.with_name(MANIFEST_PATH.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+def _up_to_date(entry, digest, settings):
+    """True if a manifest entry was made from these bytes with these settings and its files exist."""
+    if not entry or entry.get("sha256") != digest or entry.get("settings") != settings:
+        return False
+    paths = [out["path"] for out in entry["outputs"].values() if "path" in out]
+    paths += [path for widths in entry.get("ladder", {}).values() for path in widths.values()]
+    return all(Path(path).exists() for path in paths)
+
+def project_key(source_key):
+    """Group used in the size report: projects/<id>, portfolio, about, ..."""
+    parts = Path(source_key).relative_to(SOURCE_DIR).parts
+    if parts[0] == "projects" and len(parts) > 2:
+        return f"projects/{parts[1]}"
+    return parts[0] if len(parts) > 1 else "(root)"
+
+def size_report(manifest, formats):
+    """Per-project source bytes, derivative bytes and savings of the best format."""
+    report = {}
+    for source_key, entry in manifest.items():
+        group = report.setdefault(project_key(source_key), {"images": 0, "source_bytes": 0, "best_bytes": 0,
+                                                            **{f"{fmt}_bytes": 0 for fmt in formats}})
+        group["images"] += 1
+        group["source_bytes"] += entry["source_bytes"]
+        best = entry["source_bytes"]
+        for fmt in formats:
+            out = entry["outputs"].get(fmt)
+            kept = out is not None and "skipped" not in out
+            group[f"{fmt}_bytes"] += out["bytes"] if kept else entry["source_bytes"]
+            if kept:
+                best = min(best, out["bytes"])
+        group["best_bytes"] += best
+    for group in report.values():
+        group["saved_bytes"] = group["source_bytes"] - group["best_bytes"]
+    return dict(sorted(report.items()))
+
+def print_report(report, formats):
+    print(f"\n{'Project':<44} {'Images':>6} {'Source':>12} " + " ".join(f"{fmt.upper():>12}" for fmt in formats) +
+          f" {'Saved':>12}")
+    totals = {"images": 0, "source_bytes": 0, "saved_bytes": 0, **{f"{fmt}_bytes": 0 for fmt in formats}}
+    for name, group in report.items():
+        for key in totals:
+            totals[key] += group[key]
+        print(f"{name:<44} {group['images']:>6} {group['source_bytes']:>12,} " +
+              " ".join(f"{group[f'{fmt}_bytes']:>12,}" for fmt in formats) + f" {group['saved_bytes']:>12,}")
+    print(f"{'TOTAL':<44} {totals['images']:>6} {totals['source_bytes']:>12,} " +
+          " ".join(f"{totals[f'{fmt}_bytes']:>12,}" for fmt in formats) + f" {totals['saved_bytes']:>12,}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Write WebP/AVIF derivatives of public/images")
+    parser.add_argument('--formats', nargs='+', choices=['webp', 'avif'], default=None,
+                        help="Formats to produce (default: webp, plus avif when supported)")
+    parser.add_argument('--webp-quality', type=int, default=WEBP_QUALITY,
+                        help=f"WebP quality 0-100 (default: {WEBP_QUALITY})")
+    parser.add_argument('--avif-quality', type=int, default=AVIF_QUALITY,
+                        help=f"AVIF quality 0-100 (default: {AVIF_QUALITY})")
+    parser.add_argument('--widths', type=int, nargs='*', default=list(responsive_images.WIDTHS),
+                        help=f"srcset widths (default: {' '.join(map(str, responsive_images.WIDTHS))})")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="Re-encode even if the source is unchanged")
+    args = parser.parse_args()
+
+    formats = args.formats or default_formats()
+    if 'avif' in formats and not avif_supported():
+        print("AVIF is not supported by this Pillow build, writing WebP only")
+        formats = [fmt for fmt in formats if fmt != 'avif']
+    settings = {"formats": formats, "webp_quality": args.webp_quality, "avif_quality": args.avif_quality,
+                "widths": sorted(args.widths)}
+
+    print("=" * 70)
+    print(f"Optimising {SOURCE_DIR} -> {OPTIMIZED_DIR} ({', '.join(formats)})")
+    print("=" * 70)
+
+    manifest = load_manifest()
+    sources = find_sources()
+    taken = set()
+    jobs = []
+    skipped = 0
+    for source in sources:
+        key = source.as_posix()
+        base = derivative_base(source, taken)
+        digest = image_store.hash_file(source)
+        if not args.force and _up_to_date(manifest.get(key), digest, settings):
+            skipped += 1
+            continue
+        jobs.append((key, base, digest, source.stat().st_size))
+
+    print(f"  {len(sources)} images, {skipped} unchanged, {len(jobs)} to encode")
+
+    # Drop entries for sources that no longer exist
+    present = {source.as_posix() for source in sources}
+    for key in [key for key in manifest if key not in present]:
+        del manifest[key]
+
+    with ProcessPoolExecutor(args.workers) as pool:
+        futures = {pool.submit(optimise_one, key, str(base), formats, settings): (key, digest, size)
+                   for key, base, digest, size in jobs}
+        for done, future in enumerate(futures, 1):
+            key, digest, size = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  [ERROR] {key}: {e}")
+                continue
+            manifest[key] = {"sha256": digest, "settings": settings, "source_bytes": size, **result}
+            best = min([out["bytes"] for out in result["outputs"].values() if "skipped" not in out] or [size])
+            print(f"  [{done}/{len(jobs)}] {key}: {size:,} -> {best:,} bytes")
+            if done % 25 == 0:
+                save_manifest(manifest)
+
+    save_manifest(manifest)
+
+    report = size_report(manifest, formats)
+    print_report(report, formats)
+    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nManifest: {MANIFEST_PATH}")
+    print(f"Report: {REPORT_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Shared renderer for the project cards grid in projects.html, used by
+update_projects_cards.py and update_projects_page.py.
+
+The card markup is a str.format-style template compiled once at import:
+fields are escaped with escape_html() unless marked `!s` (safe), which is
+reserved for markup the renderer builds itself (the cover <picture>, the
+placeholder style attribute, the button colour classes) and the card's HTML
+comment, which holds the raw title with any `--` removed. Rendering a card
+is a single format call, and update_grid() streams the page and one chunk
+per card straight into the output file, so memory stays flat however many
+projects there are.
+
+Each card is a dict with id, title, category, description and image; the
+description is used as given, so callers decide how much of it to show.
+"""
+
+import os
+import re
+import string
+
+from image_dimensions import DimensionIndex
+from responsive_images import card_image, load_manifest, load_placeholders, placeholder_style
+
+GRID_MARKER = '<!-- Project Grid -->'
+GRID_END = '</section>'
+IMAGE_CLASS = "project-image absolute inset-0 w-full h-full object-cover"
+
+# Button gradients, cycled through card by card: (from, to, shadow colour)
+BUTTON_COLORS = [
+    ('from-purple-600', 'to-blue-600', 'purple'),
+    ('from-blue-600', 'to-purple-600', 'blue'),
+    ('from-emerald-600', 'to-teal-600', 'emerald'),
+    ('from-purple-600', 'to-pink-600', 'purple'),
+    ('from-indigo-600', 'to-purple-600', 'indigo'),
+    ('from-orange-600', 'to-red-600', 'orange'),
+    ('from-cyan-600', 'to-blue-600', 'cyan'),
+    ('from-pink-600', 'to-rose-600', 'pink'),
+    ('from-violet-600', 'to-purple-600', 'violet'),
+    ('from-teal-600', 'to-cyan-600', 'teal'),
+    ('from-amber-600', 'to-orange-600', 'amber'),
+    ('from-green-600', 'to-emerald-600', 'green'),
+    ('from-red-600', 'to-pink-600', 'red'),
+    ('from-blue-600', 'to-cyan-600', 'blue'),
+    ('from-purple-600', 'to-indigo-600', 'purple'),
+    ('from-pink-600', 'to-purple-600', 'pink'),
+    ('from-cyan-600', 'to-teal-600', 'cyan'),
+    ('from-indigo-600', 'to-blue-600', 'indigo'),
+    ('from-violet-600', 'to-pink-600', 'violet'),
+    ('from-rose-600', 'to-pink-600', 'rose'),
+    ('from-orange-600', 'to-amber-600', 'orange'),
+    ('from-teal-600', 'to-green-600', 'teal'),
+    ('from-blue-600', 'to-indigo-600', 'blue'),
+]
+ACCENTS = ('text-accent-purple', 'text-accent-blue')
+
+# The indentation before GRID_MARKER is kept from the page, so the grid starts at the marker
+GRID_OPEN = f'''{GRID_MARKER}
+            <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-4 lg:gap-5">
+'''
+GRID_CLOSE = '            </div>'
+
+CARD_TEMPLATE = '''                <!-- {comment!s} -->
+                <div class="project-card glass-card rounded-2xl overflow-hidden group">
+                    <div class="relative aspect-[8/3] project-placeholder overflow-hidden"{placeholder!s}>
+                        {cover!s}
+                        <div class="project-overlay absolute inset-0 flex items-end justify-center p-8">
+                            <a href="project.html?id={id}" class="view-button bg-gradient-to-r {button!s} transition-all shadow-lg shadow-{shadow!s}-500/30">
+                                View Case Study
+                            </a>
+                        </div>
+                    </div>
+                    <div class="p-6 md:p-8">
+                        <span class="text-xs font-bold {accent!s} uppercase tracking-widest">{category}</span>
+                        <h3 class="text-[1.05rem] md:text-[1.3125rem] font-black text-white mt-4 mb-3 leading-tight">{title}</h3>
+                        <p class="text-gray-400 text-sm md:text-base leading-relaxed font-light">{description}</p>
+                    </div>
+                </div>
+
+'''
+
+_NEEDS_ESCAPE = re.compile(r'[&<>"]')
+_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+def escape_html(text):
+    """Escape HTML special characters. Text without any is returned as is."""
+    if not text:
+        return ""
+    if _NEEDS_ESCAPE.search(text) is None:
+        return text
+    return text.translate(_ESCAPES)
+
+class Template:
+    """
+    A str.format-style template parsed once. Fields are HTML-escaped when
+    rendered unless written `{name!s}`; format specs aren't supported.
+    """
+
+    def __init__(self, text):
+        pieces = []
+        self.fields = []
+        self.escaped = set()
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            pieces.append(literal.replace('{', '{{').replace('}', '}}'))
+            if field is None:
+                continue
+            if spec or conversion not in (None, 's'):
+                raise ValueError(f"unsupported field {{{field}!{conversion}:{spec}}}")
+            pieces.append('{' + field + '}')
+            if field not in self.fields:
+                self.fields.append(field)
+            if conversion is None:
+                self.escaped.add(field)
+        self._format = ''.join(pieces).format
+
+    def render(self, values):
+        """The template filled from values (a mapping with every field)."""
+        return self._format(**{field: escape_html(values[field]) if field in self.escaped else values[field]
+                               for field in self.fields})
+
+CARD = Template(CARD_TEMPLATE)
+
+def _button_styles():
+    styles = []
+    for color_from, color_to, shadow in BUTTON_COLORS:
+        hover = f"hover:{color_from.replace('600', '500')} hover:{color_to.replace('600', '500')}"
+        button = (f"{color_from} {color_to} text-white px-10 py-4 rounded-full font-bold text-sm "
+                  f"uppercase tracking-wider {hover}")
+        styles.append((button, shadow))
+    return styles
+
+BUTTON_STYLES = _button_styles()
+
+def iter_cards(cards, manifest, placeholders, dimensions):
+    """Yield the markup for each card in turn."""
+    for idx, card in enumerate(cards):
+        image = card['image']
+        button, shadow = BUTTON_STYLES[idx % len(BUTTON_STYLES)]
+        style = placeholder_style(image, placeholders)
+        yield CARD.render({
+            'id': card['id'],
+            'title': card['title'],
+            'comment': card['title'].replace('--', ''),  # Comments aren't entity-decoded; '--' would end one
+            'category': card['category'],
+            'description': card['description'],
+            # srcset/sizes when optimize_images.py has made derivatives, with the intrinsic size
+            'cover': card_image(image, escape_html(card['title']), IMAGE_CLASS, manifest, indent=' ' * 24,
+                                size=dimensions.get(image)),
+            # Blurred preview and dominant colour when image_placeholders.py has run
+            'placeholder': f' style="{style}"' if style else '',
+            'button': button,
+            'shadow': shadow,
+            'accent': ACCENTS[idx % 2],
+        })
+
+def update_grid(path, cards):
+    """
+    Replace the project grid in the page at path with cards, writing the
+    page atomically. Returns the number of cards written, or None if the
+    page has no project grid.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    grid_start = html.find(GRID_MARKER)
+    grid_end = html.find(GRID_END, grid_start)
+    if grid_start == -1 or grid_end == -1:
+        return None
+
+    dimensions = DimensionIndex()
+    count = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(html[:grid_start])
+        f.write(GRID_OPEN)
+        for count, chunk in enumerate(iter_cards(cards, load_manifest(), load_placeholders(), dimensions), 1):
+            f.write(chunk)
+        f.write(GRID_CLOSE)
+        f.write(html[grid_end:])
+    os.replace(tmp_path, path)
+    dimensions.save()
+    return count
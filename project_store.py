@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Canonical project data, in one SQLite file (STORE_PATH).
+
+The site shows each project in three places, with different content:
+  - Project:     the Next.js record that data/projects.ts exports
+  - ProjectPage: the case study project.html shows
+  - Card:        the curated title, text and cover of its projects.html
+                 card; pages without one get a card from the page itself
+All are kept here, keyed by project id, with indexes on category and tag.
+The generators read the store and write everything the site loads:
+    ts_source()     -> the projectsRaw array in data/projects.ts
+    write_shards()  -> one compact JSON file per page in SHARD_DIR
+    index_source()  -> the `const projectShards` index in project.html
+    (project_cards.update_grid renders the cards from store.pages() and store.cards())
+so nothing has to re-parse a source file to look a project up.
+
+project.html only carries the index (project id -> a hash of its shard,
+used to bust caches), and loadProject() fetches the one shard it needs,
+so the page stays the same size however many projects there are.
+
+Records keep their typed fields in __slots__; anything else (the long-form
+case study fields) is kept in `extra`, and the original key order is kept
+so the generated literals read like the hand-written ones.
+
+Usage:
+    python project_store.py import    # (re)load data/projects.ts and the shards into the store
+    python project_store.py ts        # write data/projects.ts from the store
+    python project_store.py page      # write the shards and project.html's index from the store
+    python project_store.py list [--category C] [--tag T] [--pages | --cards]
+"""
+
+import json
+import hashlib
+import sqlite3
+import argparse
+from pathlib import Path
+
+import js_literal
+from image_dimensions import DimensionIndex
+from responsive_images import dimension_map, load_placeholders, placeholder_map
+
+STORE_PATH = Path("data/projects.db")
+TS_PATH = Path("data/projects.ts")
+PAGE_PATH = Path("project.html")
+TS_DECLARATION = "projectsRaw"
+INDEX_DECLARATION = "projectShards"
+SHARD_DIR = Path("public/data/projects")  # Also the URL project.html fetches them from
+SHARD_HASH_LENGTH = 12
+
+# Longest line a list of strings is kept on before it is split one per line.
+# 56 matches the hand-wrapped projects.ts everywhere but one stats line.
+TS_WIDTH = 56
+# Computed when the shards are written, never stored
+DERIVED_PAGE_FIELDS = ("placeholders", "dimensions")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    category TEXT NOT NULL,
+    image TEXT NOT NULL,
+    hidden INTEGER NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projects_category ON projects (category);
+
+CREATE TABLE IF NOT EXISTS pages (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    category TEXT NOT NULL,
+    image TEXT NOT NULL,
+    hidden INTEGER NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_category ON pages (category);
+
+CREATE TABLE IF NOT EXISTS cards (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    category TEXT NOT NULL,
+    image TEXT NOT NULL,
+    hidden INTEGER NOT NULL,
+    record TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tags (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (kind, id, tag)
+);
+CREATE INDEX IF NOT EXISTS tags_by_tag ON tags (kind, tag);
+"""
+
+class Record:
+    """
+    Typed fields (FIELDS: name -> type) in slots, everything else in extra.
+    Missing fields default to the type's empty value.
+    """
+
+    __slots__ = ('extra', 'order')
+    FIELDS = {}
+
+    def __init__(self, **values):
+        self.order = list(values)
+        for name, kind in self.FIELDS.items():
+            value = values.pop(name, None)
+            if value is None:
+                value = kind()
+            elif not isinstance(value, kind):
+                raise TypeError(f"{type(self).__name__}.{name} must be {kind.__name__}, "
+                                f"not {type(value).__name__}")
+            setattr(self, name, value)
+        self.extra = values
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def to_dict(self):
+        """The record as a plain dict, in its original key order."""
+        data = {}
+        for key in self.order:
+            if key in self.FIELDS:
+                data[key] = getattr(self, key)
+            elif key in self.extra:
+                data[key] = self.extra[key]
+        for key, kind in self.FIELDS.items():
+            if key not in data and getattr(self, key) != kind():
+                data[key] = getattr(self, key)
+        for key, value in self.extra.items():
+            data.setdefault(key, value)
+        return data
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.id!r})"
+
+class Project(Record):
+    """A data/projects.ts record; the case study fields are in extra."""
+
+    __slots__ = ('id', 'title', 'category', 'description', 'image', 'tags', 'featured', 'hidden')
+    FIELDS = {'id': str, 'title': str, 'category': str, 'description': str, 'image': str,
+              'tags': list, 'featured': bool, 'hidden': bool}
+
+class ProjectPage(Record):
+    """A project.html case study. id names its shard, it isn't one of its properties."""
+
+    __slots__ = ('id', 'title', 'subtitle', 'category', 'description', 'image', 'tags', 'links', 'images')
+    FIELDS = {'id': str, 'title': str, 'subtitle': str, 'category': str, 'description': str, 'image': str,
+              'tags': list, 'links': dict, 'images': list}
+    hidden = False
+
+    def to_dict(self):
+        data = super().to_dict()
+        del data['id']
+        return data
+
+    def image_paths(self):
+        """Every image the page shows: cover, old version, gallery and design system."""
+        research = self.extra.get('research') or {}
+        return [self.image, research.get('oldVersion'), *self.images, *self.extra.get('designSystem', [])]
+
+class Card(Record):
+    """A projects.html card, written for the grid rather than taken from the case study."""
+
+    __slots__ = ('id', 'title', 'category', 'description', 'image')
+    FIELDS = {'id': str, 'title': str, 'category': str, 'description': str, 'image': str}
+    tags = ()
+    hidden = False
+
+# table -> record class
+TABLES = {'projects': Project, 'pages': ProjectPage, 'cards': Card}
+
+class ProjectStore:
+    """The SQLite store. Use as a context manager to commit and close it."""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.db.commit()
+        self.db.close()
+
+    def commit(self):
+        self.db.commit()
+
+    def _select(self, table, category=None, tag=None):
+        query = f"SELECT {table}.record FROM {table}"
+        params = []
+        if tag is not None:
+            query += f" JOIN tags ON tags.kind = ? AND tags.id = {table}.id AND tags.tag = ?"
+            params += [table, tag]
+        if category is not None:
+            query += f" WHERE {table}.category = ?"
+            params.append(category)
+        query += f" ORDER BY {table}.position"
+        record_class = TABLES[table]
+        for (record,) in self.db.execute(query, params):
+            yield record_class.from_dict(json.loads(record))
+
+    def _get(self, table, project_id):
+        row = self.db.execute(f"SELECT record FROM {table} WHERE id = ?", (project_id,)).fetchone()
+        return TABLES[table].from_dict(json.loads(row[0])) if row else None
+
+    def _put(self, table, record, position):
+        """Insert or update a record. Unchanged rows aren't rewritten, so the file stays as it was."""
+        data = record.to_dict()
+        data = {'id': record.id, **data} if table == 'pages' else data
+        encoded = json.dumps(data, ensure_ascii=False)
+        row = self.db.execute(f"SELECT position, record FROM {table} WHERE id = ?", (record.id,)).fetchone()
+        if row and row[1] == encoded and (position is None or row[0] == position):
+            return
+        if position is None:
+            position = row[0] if row else self.db.execute(
+                f"SELECT COALESCE(MAX(position) + 1, 0) FROM {table}").fetchone()[0]
+        self.db.execute(f"INSERT OR REPLACE INTO {table} (id, position, title, category, image, hidden, record) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (record.id, position, record.title, record.category, record.image,
+                         int(record.hidden), encoded))
+        self.db.execute("DELETE FROM tags WHERE kind = ? AND id = ?", (table, record.id))
+        self.db.executemany("INSERT OR IGNORE INTO tags (kind, id, tag) VALUES (?, ?, ?)",
+                            [(table, record.id, tag) for tag in record.tags])
+
+    def _replace(self, table, records):
+        """Make the table hold exactly records, in that order."""
+        keep = []
+        for position, record in enumerate(records):
+            self._put(table, record, position)
+            keep.append(record.id)
+        keep = set(keep)
+        stale = [project_id for (project_id,) in self.db.execute(f"SELECT id FROM {table}")
+                 if project_id not in keep]
+        for project_id in stale:
+            self.db.execute(f"DELETE FROM {table} WHERE id = ?", (project_id,))
+            self.db.execute("DELETE FROM tags WHERE kind = ? AND id = ?", (table, project_id))
+
+    def projects(self, category=None, tag=None):
+        """data/projects.ts records in order, optionally only one category or tag."""
+        return self._select('projects', category, tag)
+
+    def project(self, project_id):
+        return self._get('projects', project_id)
+
+    def put_project(self, project, position=None):
+        """Add or update a project; new ones go last unless position is given."""
+        self._put('projects', project, position)
+
+    def replace_projects(self, projects):
+        self._replace('projects', projects)
+
+    def pages(self, category=None, tag=None):
+        """project.html entries in order, optionally only one category or tag."""
+        return self._select('pages', category, tag)
+
+    def page(self, project_id):
+        return self._get('pages', project_id)
+
+    def put_page(self, page, position=None):
+        """Add or update a page entry; new ones go last unless position is given."""
+        self._put('pages', page, position)
+
+    def replace_pages(self, pages):
+        self._replace('pages', pages)
+
+    def cards(self, category=None):
+        """Curated projects.html cards in order, optionally only one category."""
+        return self._select('cards', category)
+
+    def card(self, project_id):
+        return self._get('cards', project_id)
+
+    def put_card(self, card, position=None):
+        """Add or update a card; new ones go last unless position is given."""
+        self._put('cards', card, position)
+
+    def replace_cards(self, cards):
+        self._replace('cards', cards)
+
+def scraped_page(project_id, data, category, image, tags=(), links=None):
+    """
+    A ProjectPage from one scraped project (a project_stream record). The
+    scrape has no category, tags or links, so the caller decides those and
+    the cover image.
+    """
+    content = data['content']
+    images = data['images']
+    page = {'title': content['title']}
+    if content.get('subtitle'):
+        page['subtitle'] = content['subtitle']
+    page['category'] = category
+    page['description'] = content['description']
+    page['image'] = image
+    if tags:
+        page['tags'] = list(tags)
+    if links:
+        page['links'] = links
+    for key in ('timeline', 'role', 'outcome', 'goals'):
+        if content.get(key):
+            page[key] = content[key]
+
+    research = content.get('research', {})
+    if research.get('method') or research.get('findings') or images.get('oldVersion'):
+        page['research'] = {key: value for key, value in (('method', research.get('method')),
+                                                          ('findings', research.get('findings')),
+                                                          ('oldVersion', images.get('oldVersion'))) if value}
+    if images.get('detailed'):
+        page['images'] = images['detailed']
+    if images.get('designSystem'):
+        page['designSystem'] = images['designSystem']
+    return ProjectPage(id=project_id, **page)
+
+def ts_source(projects):
+    """The projectsRaw array literal for data/projects.ts."""
+    return js_literal.to_source([project.to_dict() for project in projects], width=TS_WIDTH)
+
+def shard_source(page, placeholders, dimensions):
+    """
+    The JSON shard for one page: compact, with its placeholders and
+    dimensions maps ahead of its images.
+    """
+    paths = page.image_paths()
+    derived = {'placeholders': placeholder_map(paths, placeholders),
+               'dimensions': dimension_map(paths, dimensions)}
+    entry = {}
+    for key, value in page.to_dict().items():
+        if key == 'images':
+            entry.update((name, value) for name, value in derived.items() if value)
+        entry[key] = value
+    for name, value in derived.items():
+        if value:
+            entry.setdefault(name, value)
+    return json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+
+def index_source(index):
+    """The `const projectShards = {...};` declaration for project.html."""
+    entries = ''.join(f'            {json.dumps(project_id, ensure_ascii=False)}: "{digest}",\n'
+                      for project_id, digest in index.items())
+    return f"const {INDEX_DECLARATION} = {{\n{entries}        }};"
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _span(text, path, name):
+    span = js_literal.declaration_span(text, name)
+    if span is None:
+        raise js_literal.JSParseError(f"no `{name}` declaration in {path}")
+    return span
+
+def _parse(path, name):
+    declaration = js_literal.find_declaration(_read(path), name)
+    if declaration is None:
+        raise js_literal.JSParseError(f"no `{name}` declaration in {path}")
+    return declaration.value.to_python()
+
+def _write_atomic(path, text):
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    tmp_path.replace(path)
+
+def write_ts(store, path=TS_PATH):
+    """Replace the projectsRaw array in data/projects.ts, leaving the rest of the file alone."""
+    text = _read(path)
+    _, value_start, value_end, _ = _span(text, path, TS_DECLARATION)
+    _write_atomic(path, js_literal.splice(text, [(value_start, value_end, ts_source(store.projects()))]))
+
+def write_shards(store, directory=SHARD_DIR):
+    """
+    Write a JSON shard for every page, and delete shards of pages that are
+    gone. Files whose content hasn't changed aren't touched. Returns
+    (index, shards rewritten), the index mapping id -> shard hash in page order.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    placeholders = load_placeholders()
+    dimensions = DimensionIndex()
+    index = {}
+    written = 0
+    for page in store.pages():
+        source = shard_source(page, placeholders, dimensions)
+        index[page.id] = hashlib.sha256(source.encode('utf-8')).hexdigest()[:SHARD_HASH_LENGTH]
+        path = directory / f"{page.id}.json"
+        if not path.exists() or _read(path) != source:
+            _write_atomic(path, source)
+            written += 1
+    for path in directory.glob("*.json"):
+        if path.stem not in index:
+            path.unlink()
+    dimensions.save()
+    return index, written
+
+def write_page(store, path=PAGE_PATH, directory=SHARD_DIR):
+    """
+    Write the shards, then replace project.html's shard index, leaving the
+    rest of the page alone. Returns (pages, shards rewritten).
+    """
+    index, written = write_shards(store, directory)
+    text = _read(path)
+    start, _, _, end = _span(text, path, INDEX_DECLARATION)
+    _write_atomic(path, js_literal.splice(text, [(start, end, index_source(index))]))
+    return len(index), written
+
+def import_sources(store, ts_path=TS_PATH, page_path=PAGE_PATH, directory=SHARD_DIR):
+    """Load projects.ts and the shards into the store, replacing what it held. Returns (projects, pages)."""
+    projects = [Project.from_dict(data) for data in _parse(ts_path, TS_DECLARATION)]
+    pages = []
+    for project_id in _parse(page_path, INDEX_DECLARATION):
+        with open(Path(directory) / f"{project_id}.json", 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for name in DERIVED_PAGE_FIELDS:
+            data.pop(name, None)
+        pages.append(ProjectPage(id=project_id, **data))
+    store.replace_projects(projects)
+    store.replace_pages(pages)
+    return len(projects), len(pages)
+
+def main():
+    parser = argparse.ArgumentParser(description="Canonical project data store")
+    parser.add_argument('command', choices=['import', 'ts', 'page', 'list'])
+    parser.add_argument('--category', help="list: only this category")
+    parser.add_argument('--tag', help="list: only this tag")
+    parser.add_argument('--pages', action='store_true', help="list: project.html entries instead of projects.ts")
+    parser.add_argument('--cards', action='store_true', help="list: projects.html cards instead of projects.ts")
+    args = parser.parse_args()
+
+    with ProjectStore() as store:
+        if args.command == 'import':
+            projects, pages = import_sources(store)
+            print(f"Imported {projects} projects from {TS_PATH} and {pages} pages from {SHARD_DIR} "
+                  f"into {STORE_PATH}")
+        elif args.command == 'ts':
+            write_ts(store)
+            print(f"Wrote {TS_PATH}")
+        elif args.command == 'page':
+            pages, written = write_page(store)
+            print(f"Wrote {PAGE_PATH} and {written} of {pages} shards in {SHARD_DIR}")
+        else:
+            if args.cards:
+                records = store.cards(args.category)
+            else:
+                records = (store.pages if args.pages else store.projects)(args.category, args.tag)
+            for record in records:
+                print(f"  {record.id:<36} {record.category:<36} {', '.join(record.tags)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Append-only JSONL stream of scrape results.
+
+The scraper appends one line per finished project to JSONL_PATH and fsyncs
+it, so a crash keeps every project that finished. When the crawl ends, a
+final {"_complete": true} line is written and compact() atomically produces
+all_projects_scraped.json, rewriting the stream in project order.
+
+Downstream scripts read results with iter_projects(), a generator that
+yields (project_id, data) without loading the whole file. With follow=True
+it tails a stream that is still being written and stops at the completion
+marker, so consumers can start while the crawl is running. Otherwise a
+stream without the marker is never read: the consumers replace the project
+list with what they're given, and a crashed crawl's stream would drop every
+project it hadn't reached yet.
+
+Run directly to compact a stream left behind by an interrupted crawl:
+    python project_stream.py
+Its projects are merged into the existing JSON by project id, so the
+projects the crawl never reached keep their last results.
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+
+JSON_PATH = Path("all_projects_scraped.json")
+JSONL_PATH = Path("all_projects_scraped.jsonl")
+COMPLETE_MARKER = "_complete"
+FOLLOW_POLL = 0.5  # Seconds between checks for new lines when following
+TAIL_BYTES = 4096  # Enough to hold the completion marker line
+
+class IncompleteStreamError(RuntimeError):
+    """The newest results are in a stream whose crawl never finished."""
+
+class ProjectStreamWriter:
+    """Appends project results to a JSONL file, one fsynced line each."""
+
+    def __init__(self, path=JSONL_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self.count = 0
+
+    def append(self, result):
+        """Write one project's result and make sure it reached the disk."""
+        line = json.dumps(result, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.count += 1
+
+    def close(self):
+        """Mark the stream complete and close it."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(json.dumps({COMPLETE_MARKER: True, "projects": self.count}) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+def _read_records(path, follow=False, poll=FOLLOW_POLL):
+    """Yield (record, is_marker) from a JSONL file, tailing it when follow is set."""
+    with open(path, 'r', encoding='utf-8') as f:
+        buffered = ""
+        while True:
+            line = f.readline()
+            if not line:
+                if not follow:
+                    return
+                time.sleep(poll)
+                continue
+            buffered += line
+            if not buffered.endswith("\n"):
+                # Partial line: the writer is mid-append (or crashed mid-append)
+                if not follow:
+                    return
+                continue
+            text, buffered = buffered.strip(), ""
+            if not text:
+                continue
+            record = json.loads(text)
+            if record.get(COMPLETE_MARKER):
+                yield record, True
+                return
+            yield record, False
+
+def is_complete(path):
+    """True if the stream at path ends with the completion marker."""
+    with open(path, 'rb') as f:
+        f.seek(max(f.seek(0, os.SEEK_END) - TAIL_BYTES, 0))
+        lines = f.read().splitlines()
+    last = next((line for line in reversed(lines) if line.strip()), b"")
+    try:
+        record = json.loads(last)
+    except ValueError:
+        return False
+    return isinstance(record, dict) and bool(record.get(COMPLETE_MARKER))
+
+def iter_projects(follow=False, jsonl_path=JSONL_PATH, json_path=JSON_PATH):
+    """
+    Yield (project_id, data) for every scraped project.
+
+    Reads the JSONL stream when following a crawl in progress, or when the
+    stream is complete and at least as new as the compacted JSON; otherwise
+    the JSON file. Raises IncompleteStreamError if the only results are in
+    an unfinished stream.
+    """
+    jsonl_path, json_path = Path(jsonl_path), Path(json_path)
+    use_stream = follow or (jsonl_path.exists() and
+                            (not json_path.exists() or jsonl_path.stat().st_mtime >= json_path.stat().st_mtime))
+    if use_stream and not follow and not is_complete(jsonl_path):
+        if not json_path.exists():
+            raise IncompleteStreamError(
+                f"{jsonl_path} has no completion marker (interrupted crawl?) and there is no {json_path}; "
+                f"finish the crawl, or run project_stream.py to compact what it has")
+        print(f"  Ignoring {jsonl_path}: the crawl that wrote it didn't finish; reading {json_path}")
+        use_stream = False
+    if use_stream:
+        while follow and not jsonl_path.exists():
+            time.sleep(FOLLOW_POLL)
+        for record, is_marker in _read_records(jsonl_path, follow):
+            if not is_marker:
+                yield record["project_id"], record
+        return
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        yield from json.load(f).items()
+
+def _write_atomic(path, write):
+    """Write a file through a temp file and os.replace."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def compact(jsonl_path=JSONL_PATH, json_path=JSON_PATH, order=None):
+    """
+    Turn a stream into the JSON output. The last line per project wins, and
+    projects follow `order` (ids) where given, then stream order. A stream
+    without the completion marker only updates the projects it holds: they
+    are merged into the existing JSON by project id. The stream is rewritten
+    in the same order and marked complete. Returns the number of projects.
+    """
+    projects = {}
+    if not is_complete(jsonl_path):
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                projects = json.load(f)
+        except OSError:
+            pass
+    for record, is_marker in _read_records(jsonl_path):
+        if not is_marker:
+            projects[record["project_id"]] = record
+
+    order = list(order or [])
+    ranked = {project_id: i for i, project_id in enumerate(order)}
+    ids = sorted(projects, key=lambda pid: ranked.get(pid, len(order)))
+    ordered = {project_id: projects[project_id] for project_id in ids}
+
+    def write_stream(f):
+        for record in ordered.values():
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.write(json.dumps({COMPLETE_MARKER: True, "projects": len(ordered)}) + "\n")
+
+    _write_atomic(json_path, lambda f: json.dump(ordered, f, indent=2, ensure_ascii=False))
+    # Written second so the stream stays at least as new as the JSON
+    _write_atomic(jsonl_path, write_stream)
+    return len(ordered)
+
+def main():
+    """Compact the stream into the JSON output."""
+    if not JSONL_PATH.exists():
+        print(f"No stream at {JSONL_PATH}")
+        return
+    complete = is_complete(JSONL_PATH)
+    count = compact()
+    if complete:
+        print(f"Compacted {count} projects from {JSONL_PATH} into {JSON_PATH}")
+    else:
+        print(f"Merged the unfinished stream {JSONL_PATH} into {JSON_PATH} ({count} projects)")
+
+if __name__ == "__main__":
+    main()
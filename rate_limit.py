@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Adaptive per-host rate limiting for every request made through http_client.
+
+Each host gets a token bucket. A request takes a token, and tokens refill at
+the host's current rate, with up to BURST requests allowed back to back.
+The rate adapts:
+  - 429/503: the rate is cut by BACKOFF_FACTOR and the host is paused, for
+    Retry-After when the server sends one, otherwise for an exponentially
+    growing delay.
+  - SUCCESS_STREAK successes in a row: the rate grows by RAMP_UP_FACTOR,
+    up to MAX_RATE.
+So crawls run as fast as the server tolerates instead of sleeping a fixed
+delay between pages.
+"""
+
+import time
+import threading
+from email.utils import parsedate_to_datetime
+
+INITIAL_RATE = 2.0  # Requests per second per host to start with
+MIN_RATE = 0.2
+MAX_RATE = 20.0
+BURST = 4  # Requests a host may receive back to back
+BACKOFF_FACTOR = 0.5  # Rate multiplier after a throttling response
+RAMP_UP_FACTOR = 1.25  # Rate multiplier after a streak of successes
+SUCCESS_STREAK = 10
+BASE_PAUSE = 1.0  # First pause without Retry-After; doubles per consecutive throttle
+MAX_PAUSE = 60.0
+THROTTLE_STATUSES = (429, 503)
+
+def retry_after_seconds(value, now=None):
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    now = time.time() if now is None else now
+    return max(when.timestamp() - now, 0.0)
+
+class HostBucket:
+    """Token bucket and adaptive rate for one host."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.successes = 0
+        self.throttles_in_row = 0
+        # Reporting
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+class AdaptiveRateLimiter:
+    """Per-host token buckets whose rates follow the servers' throttling signals."""
+
+    def __init__(self, initial_rate=INITIAL_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE, burst=BURST):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.enabled = True
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = HostBucket(self.initial_rate, self.burst)
+        return bucket
+
+    def acquire(self, host):
+        """Block until host may receive another request. Returns the seconds waited."""
+        if not self.enabled:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                bucket = self._bucket(host)
+                now = time.monotonic()
+                bucket.refill(now)
+                wait = bucket.paused_until - now
+                if wait <= 0 and bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    bucket.requests += 1
+                    bucket.waited += waited
+                    return waited
+                wait = max(wait, (1 - bucket.tokens) / bucket.rate)
+            time.sleep(wait)
+            waited += wait
+
+    def record(self, host, status, retry_after=None):
+        """Adapt the host's rate to a response status (and Retry-After seconds, if any)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            bucket = self._bucket(host)
+            if status in THROTTLE_STATUSES:
+                now = time.monotonic()
+                bucket.throttled += 1
+                bucket.successes = 0
+                bucket.tokens = 0.0
+                # Requests already in flight when the host was paused report the
+                # same overload; only the first one cuts the rate
+                if now >= bucket.paused_until:
+                    bucket.throttles_in_row += 1
+                    bucket.rate = max(self.min_rate, bucket.rate * BACKOFF_FACTOR)
+                if retry_after is None:
+                    retry_after = min(MAX_PAUSE, BASE_PAUSE * 2 ** (bucket.throttles_in_row - 1))
+                bucket.paused_until = max(bucket.paused_until, now + retry_after)
+            elif status < 500:
+                bucket.throttles_in_row = 0
+                bucket.successes += 1
+                if bucket.successes >= SUCCESS_STREAK:
+                    bucket.rate = min(self.max_rate, bucket.rate * RAMP_UP_FACTOR)
+                    bucket.successes = 0
+
+    def configure(self, initial_rate=None, min_rate=None, max_rate=None, burst=None, enabled=None):
+        """Change limits; hosts seen so far start over from the new initial rate."""
+        with self._lock:
+            if initial_rate is not None:
+                self.initial_rate = initial_rate
+            if min_rate is not None:
+                self.min_rate = min_rate
+            if max_rate is not None:
+                self.max_rate = max_rate
+            if burst is not None:
+                self.burst = burst
+            if enabled is not None:
+                self.enabled = enabled
+            self._buckets.clear()
+
+    def stats(self):
+        """Per-host request counts, throttles, time spent waiting and current rate."""
+        with self._lock:
+            return {
+                host: {"requests": b.requests, "throttled": b.throttled, "waited": b.waited, "rate": b.rate}
+                for host, b in self._buckets.items()
+            }
+
+limiter = AdaptiveRateLimiter()
+
+def print_rate_stats():
+    """Print how each host's rate limit behaved."""
+    stats = limiter.stats()
+    if not stats:
+        return
+    print("\nRate limits:")
+    for host, entry in sorted(stats.items()):
+        print(f"  {host}: {entry['requests']} requests, {entry['throttled']} throttled, "
+              f"{entry['waited']:.1f}s waiting, now {entry['rate']:.2f} req/s")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Responsive image markup for the generated project cards.
+
+optimize_images.py writes a width ladder (WIDTHS) of WebP/AVIF derivatives
+for every image and records them in the optimisation manifest. card_image()
+turns a card's cover image into a <picture> whose srcset/sizes match the
+projects grid, so phones fetch a 400px cover instead of the full-size PNG.
+Images without derivatives keep the plain <img> markup.
+
+image_placeholders.py records a blurred preview and dominant colour per
+project image; placeholder_style() and placeholder_map() embed them so the
+image's container is painted before the image itself arrives.
+
+Intrinsic sizes come from image_dimensions.DimensionIndex: card_image() puts
+them on the <img>, and dimension_map() embeds them in project.html.
+"""
+
+import json
+from pathlib import Path
+
+MANIFEST_PATH = Path("public/images/optimized/manifest.json")
+PLACEHOLDERS_PATH = Path("data/placeholders.json")  # Build data, not deployed
+
+WIDTHS = (400, 800, 1200, 1600)
+# Preferred first: the browser takes the first <source> whose type it supports
+SOURCE_TYPES = (("avif", "image/avif"), ("webp", "image/webp"))
+
+# Layout of the projects grid (grid-cols-1 md:grid-cols-2 lg:grid-cols-3
+# xl:grid-cols-4 gap-4 lg:gap-5 inside px-4 md:px-8 lg:px-12, max-w-[1510px]).
+# (min viewport width, columns, horizontal padding per side, gap), widest first
+GRID_LAYOUT = [
+    (1280, 4, 48, 20),
+    (1024, 3, 48, 20),
+    (768, 2, 32, 16),
+    (0, 1, 16, 16),
+]
+GRID_MAX_WIDTH = 1510
+
+def grid_sizes(layout=GRID_LAYOUT, max_width=GRID_MAX_WIDTH):
+    """The sizes attribute for an image filling one cell of the grid."""
+    _, columns, padding, gap = layout[0]
+    # Past this viewport the container stops growing, so cells have a fixed width
+    sizes = [f"(min-width: {max_width + 2 * padding}px) {round((max_width - (columns - 1) * gap) / columns)}px"]
+    for min_width, columns, padding, gap in layout:
+        fixed = 2 * padding + (columns - 1) * gap
+        width = f"calc({round(100 / columns, 2):g}vw - {round(fixed / columns)}px)"
+        sizes.append(f"(min-width: {min_width}px) {width}" if min_width else width)
+    return ", ".join(sizes)
+
+CARD_SIZES = grid_sizes()
+
+def _load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_manifest(path=MANIFEST_PATH):
+    """The optimisation manifest, or {} before optimize_images.py has run."""
+    return _load_json(path)
+
+def load_placeholders(path=PLACEHOLDERS_PATH):
+    """Placeholders by image path, or {} before image_placeholders.py has run."""
+    return _load_json(path)
+
+def srcset(entry, fmt):
+    """srcset for one format of a manifest entry: the ladder plus the full-size derivative."""
+    candidates = {int(width): path for width, path in entry.get("ladder", {}).get(fmt, {}).items()}
+    full = entry.get("outputs", {}).get(fmt, {})
+    if "path" in full and entry.get("width"):
+        candidates[entry["width"]] = full["path"]
+    return ", ".join(f"{path} {width}w" for width, path in sorted(candidates.items()))
+
+def card_image(src, alt, img_class, manifest, sizes=CARD_SIZES, indent="", size=None):
+    """
+    Markup for a card cover: a <picture> with AVIF/WebP sources when src has
+    derivatives in the manifest, otherwise the plain <img>. size is the
+    image's (width, height), if known. alt is inserted as given, so escape
+    it first.
+    """
+    dims = f' width="{size[0]}" height="{size[1]}"' if size else ''
+    img = f'<img src="{src}" alt="{alt}" class="{img_class}"{dims}>'
+    entry = manifest.get(src)
+    if not entry:
+        return img
+    sources = []
+    for fmt, mime in SOURCE_TYPES:
+        candidates = srcset(entry, fmt)
+        if candidates:
+            sources.append(f'{indent}    <source type="{mime}" srcset="{candidates}" sizes="{sizes}">')
+    if not sources:
+        return img
+    return "<picture>\n" + "\n".join(sources) + f"\n{indent}    {img}\n{indent}</picture>"
+
+def placeholder_style(src, placeholders):
+    """
+    Inline CSS painting an image's dominant colour and blurred preview as
+    its container's background, or "" if src has no placeholder.
+    """
+    entry = placeholders.get(src)
+    if not entry:
+        return ""
+    return (f"background-color: {entry['color']}; background-image: url({entry['lqip']}); "
+            "background-size: cover; background-position: center;")
+
+def placeholder_map(paths, placeholders):
+    """
+    The placeholders for a project's images, {path: [colour, LQIP]}, as
+    embedded in project.html's projects object. Paths without one are left out.
+    """
+    return {path: [placeholders[path]["color"], placeholders[path]["lqip"]]
+            for path in dict.fromkeys(paths) if path in placeholders}
+
+def dimension_map(paths, index):
+    """{path: [width, height]} for the paths a DimensionIndex can size."""
+    sizes = {}
+    for path in dict.fromkeys(paths):
+        size = index.get(path) if path else None
+        if size:
+            sizes[path] = list(size)
+    return sizes
@@ -3,11 +3,13 @@ Script to scrape the about page from bcampbelldesigns.com
 """
 
 import os
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 
+import http_cache
+import http_client
+from html_parsing import make_soup
+
 BASE_URL = "https://www.bcampbelldesigns.com/about"
 OUTPUT_DIR = Path("public/images/about")
 
@@ -16,13 +18,9 @@ def scrape_about_page():
     print(f"Scraping about page from {BASE_URL}")
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(BASE_URL, headers=headers, timeout=30)
-        response.raise_for_status()
+        response = http_cache.get_page(BASE_URL)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         
         # Create output directory
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -53,29 +51,22 @@ def scrape_about_page():
                 if not src.startswith('http'):
                     src = urljoin(BASE_URL, src)
                 
+                # Get filename
+                filename = os.path.basename(urlparse(src).path)
+                if not filename or '.' not in filename:
+                    filename = f"about-image-{len(downloaded_images) + 1}.jpg"
+                
                 # Download image
-                try:
-                    img_response = requests.get(src, headers=headers, timeout=30)
-                    img_response.raise_for_status()
-                    
-                    # Get filename
-                    filename = os.path.basename(urlparse(src).path)
-                    if not filename or '.' not in filename:
-                        filename = f"about-image-{len(downloaded_images) + 1}.jpg"
-                    
-                    filepath = OUTPUT_DIR / filename
-                    with open(filepath, 'wb') as f:
-                        f.write(img_response.content)
-                    
+                filepath = OUTPUT_DIR / filename
+                if http_client.download_image(src, str(filepath), fix_extension=False):
                     downloaded_images.append(f"/images/about/{filename}")
-                    print(f"✓ Downloaded: {filename}")
-                except Exception as e:
-                    print(f"✗ Error downloading {src}: {e}")
         
         # Print structured content
         print("\n=== STRUCTURED CONTENT ===")
         print("Use this content to build the about page:")
         print("\nContent extracted successfully!")
+        http_client.print_connection_stats()
+        http_cache.print_cache_stats()
         
         return {
             'html': str(soup),
@@ -5,15 +5,34 @@ Final comprehensive scraper with correct URLs
 
 import os
 import json
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
 from urllib.parse import urljoin, urlparse, unquote
 from pathlib import Path
 import re
 import time
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import http_cache
+import http_client
+import rate_limit
+import project_stream
+from html_parsing import make_soup
+from content_extractor import extract_content
 
 BASE_URL = "https://www.bcampbelldesigns.com"
 OUTPUT_DIR = Path("public/images/projects")
+OUTPUT_JSON = project_stream.JSON_PATH
+OUTPUT_JSONL = project_stream.JSONL_PATH  # Appended to as each project finishes
+MANIFEST_PATH = Path("scrape_manifest.json")
+
+# Concurrent crawl defaults
+MAX_CONCURRENCY = 6  # Pages being fetched/processed at once
+PER_HOST_LIMIT = 2  # Simultaneous requests to a single host
+QUEUE_SIZE = 4  # Pages buffered between pipeline stages
 
 # Correct URL mapping from homepage
 PROJECT_URL_MAP = {
@@ -49,128 +68,12 @@ def slugify(text):
     text = re.sub(r'[-\s]+', '-', text)
     return text.strip('-')
 
-def download_image(url, filepath):
-    """Download an image from URL to filepath."""
-    try:
-        if not url.startswith('http'):
-            url = urljoin(BASE_URL, url)
-        
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, timeout=30, headers=headers, stream=True)
-        response.raise_for_status()
-        
-        ext = os.path.splitext(urlparse(url).path)[1]
-        if not ext or ext not in ['.jpg', '.jpeg', '.png', '.webp', '.gif']:
-            content_type = response.headers.get('content-type', '')
-            if 'jpeg' in content_type or 'jpg' in content_type:
-                ext = '.jpg'
-            elif 'png' in content_type:
-                ext = '.png'
-            elif 'webp' in content_type:
-                ext = '.webp'
-            else:
-                ext = '.png'
-        
-        if not filepath.endswith(ext):
-            filepath = os.path.splitext(filepath)[0] + ext
-        
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        return filepath
-    except Exception as e:
-        print(f"      [ERROR] {e}")
-        return None
-
-def extract_content(soup):
-    """Extract structured content from page."""
-    content = {
-        "title": "",
-        "subtitle": "",
-        "description": "",
-        "timeline": "",
-        "role": "",
-        "outcome": "",
-        "goals": [],
-        "research": {"method": "", "findings": [], "oldVersion": None}
-    }
-    
-    # Title
-    h1 = soup.find('h1')
-    if h1:
-        content["title"] = h1.get_text(strip=True)
-        # Check for subtitle in next h2/h3
-        next_heading = h1.find_next_sibling(['h2', 'h3'])
-        if next_heading:
-            content["subtitle"] = next_heading.get_text(strip=True)
-    
-    # Description/Overview
-    overview_text = soup.find(string=re.compile(r'Project Overview|Overview', re.I))
-    if overview_text:
-        parent = overview_text.find_parent()
-        if parent:
-            desc = parent.find_next(['p', 'div'])
-            if desc:
-                content["description"] = desc.get_text(strip=True)
-    
-    # Timeline
-    timeline_elem = soup.find(string=re.compile(r'Project Timeline|Timeline', re.I))
-    if timeline_elem:
-        parent = timeline_elem.find_parent()
-        if parent:
-            timeline_val = parent.find_next(['p', 'div', 'span'])
-            if timeline_val:
-                content["timeline"] = timeline_val.get_text(strip=True)
-    
-    # Role
-    role_elem = soup.find(string=re.compile(r'My role|Role|My Role', re.I))
-    if role_elem:
-        parent = role_elem.find_parent()
-        if parent:
-            role_val = parent.find_next(['p', 'div'])
-            if role_val:
-                content["role"] = role_val.get_text(strip=True)
-    
-    # Goals
-    goals_elem = soup.find(string=re.compile(r'Goals|Goal', re.I))
-    if goals_elem:
-        parent = goals_elem.find_parent()
-        if parent:
-            goals_list = parent.find_next(['ul', 'ol'])
-            if goals_list:
-                for li in goals_list.find_all('li'):
-                    goal = li.get_text(strip=True)
-                    if goal:
-                        content["goals"].append(goal)
-    
-    # Research
-    research_elem = soup.find(string=re.compile(r'Data Analysis|User Research|Research', re.I))
-    if research_elem:
-        parent = research_elem.find_parent()
-        if parent:
-            method_p = parent.find_next('p')
-            if method_p:
-                content["research"]["method"] = method_p.get_text(strip=True)
-            
-            findings_elem = parent.find(string=re.compile(r'Findings', re.I))
-            if findings_elem:
-                findings_parent = findings_elem.find_parent()
-                if findings_parent:
-                    findings_list = findings_parent.find_next(['ul', 'ol'])
-                    if findings_list:
-                        for li in findings_list.find_all('li'):
-                            finding = li.get_text(strip=True)
-                            if finding:
-                                content["research"]["findings"].append(finding)
-    
-    return content
-
-def extract_and_download_images(soup, project_id, base_url):
-    """Extract images and download them locally."""
-    images = {"oldVersion": None, "detailed": [], "designSystem": []}
+def plan_images(soup, project_id, base_url):
+    """
+    Classify the page's images without downloading anything.
+    Returns a list of (category, src, filepath, local_path) tuples in page order.
+    """
+    plan = []
     
     all_images = soup.find_all('img')
     project_dir = OUTPUT_DIR / project_id
@@ -204,18 +107,51 @@ def extract_and_download_images(soup, project_id, base_url):
             if 'design system' in parent_text or 'component' in parent_text:
                 filepath = design_system_dir / f"{slugged_name}.png"
                 local_path = f"public/images/projects/{project_id}/design-system/{slugged_name}.png"
-                if download_image(src, str(filepath)):
-                    images["designSystem"].append(local_path)
+                plan.append(("designSystem", src, filepath, local_path))
             elif 'overwolf' in filename.lower() or 'old' in filename.lower() or 'intro' in filename.lower():
                 filepath = project_dir / "old-version.png"
                 local_path = f"public/images/projects/{project_id}/old-version.png"
-                if download_image(src, str(filepath)):
-                    images["oldVersion"] = local_path
+                plan.append(("oldVersion", src, filepath, local_path))
             else:
                 filepath = project_dir / f"{slugged_name}.png"
                 local_path = f"public/images/projects/{project_id}/{slugged_name}.png"
-                if download_image(src, str(filepath)):
-                    images["detailed"].append(local_path)
+                plan.append(("detailed", src, filepath, local_path))
+    
+    return plan
+
+def fetch_planned_images(plan, known_images=None):
+    """
+    Download the images in a plan. Returns image URL -> the local path it was
+    saved at, which keeps the planned name but may have a corrected
+    extension. Images listed in known_images (src -> local_path) whose file
+    is still on disk are reused instead of fetched again.
+    """
+    saved = {}
+    known_images = known_images or {}
+    
+    for _, src, filepath, local_path in plan:
+        stem = os.path.splitext(local_path)[0]
+        known = known_images.get(src)
+        if known and os.path.splitext(known)[0] == stem and os.path.exists(known):
+            saved[src] = known
+            continue
+        final_path = http_client.download_image(src, str(filepath), base_url=BASE_URL)
+        if final_path:
+            saved[src] = stem + os.path.splitext(final_path)[1]
+    
+    return saved
+
+def group_images(plan, saved):
+    """Group the saved local paths of a plan's images by category."""
+    images = {"oldVersion": None, "detailed": [], "designSystem": []}
+    
+    for category, src, _, _ in plan:
+        if src not in saved:
+            continue
+        if category == "oldVersion":
+            images["oldVersion"] = saved[src]
+        else:
+            images[category].append(saved[src])
     
     # Remove duplicates
     images["detailed"] = list(dict.fromkeys(images["detailed"]))
@@ -223,59 +159,340 @@ def extract_and_download_images(soup, project_id, base_url):
     
     return images
 
-def scrape_project(project_id, project_url):
+def download_planned_images(plan, known_images=None):
+    """Download the images in a plan and group their local paths by category."""
+    return group_images(plan, fetch_planned_images(plan, known_images))
+
+def extract_and_download_images(soup, project_id, base_url, known_images=None):
+    """Extract images and download them locally."""
+    return download_planned_images(plan_images(soup, project_id, base_url), known_images)
+
+def relevant_dom_hash(soup):
+    """
+    Hash the parts of the page that feed extract_content/plan_images: tag
+    structure, image/link URLs and text, skipping scripts, styles and other
+    per-request noise that changes without the case study changing.
+    """
+    digest = hashlib.sha256()
+    for element in (soup.body or soup).find_all(True):
+        if element.name in ('script', 'style', 'noscript', 'template'):
+            continue
+        attrs = [(key, element.get(key)) for key in ('src', 'data-src', 'data-lazy-src', 'href') if element.get(key)]
+        digest.update(f"<{element.name} {attrs}>".encode('utf-8'))
+        for string in element.find_all(string=True, recursive=False):
+            digest.update(string.strip().encode('utf-8'))
+    return digest.hexdigest()
+
+class ScrapeManifest:
+    """
+    Per-project record of the last scrape: the relevant-DOM hash, the
+    extracted content, the image plan and the image URLs with the local
+    paths they were saved to. Unchanged projects are copied forward from the
+    previous JSON output without being re-extracted.
+    """
+    
+    def __init__(self, path=MANIFEST_PATH, previous_output=OUTPUT_JSON, full=False):
+        self.path = Path(path)
+        self.full = full
+        self.entries = self._load_json(self.path)
+        self.previous = self._load_json(previous_output)
+        self.unchanged = []
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _load_json(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def known_hash(self, project_id):
+        """DOM hash of the last scrape, if its content and plan can stand in for a re-extraction."""
+        if self.full:
+            return None
+        entry = self.entries.get(project_id)
+        if not entry or "content" not in entry or "plan" not in entry:
+            return None
+        return entry.get("dom_hash")
+    
+    def previous_parse(self, project_id):
+        """The last scrape's result in parse_project_page()'s shape."""
+        entry = self.entries[project_id]
+        return {
+            "dom_hash": entry["dom_hash"],
+            "content": entry["content"],
+            "plan": [(category, src, Path(filepath), local_path)
+                     for category, src, filepath, local_path in entry["plan"]],
+        }
+    
+    def reuse(self, project_id, dom_hash):
+        """Return the previous result if the project page is unchanged, else None."""
+        if self.full:
+            return None
+        entry = self.entries.get(project_id)
+        previous = self.previous.get(project_id)
+        if not entry or not previous or entry.get("dom_hash") != dom_hash:
+            return None
+        if any(not os.path.exists(path) for path in entry.get("image_urls", {}).values()):
+            return None
+        with self._lock:
+            self.unchanged.append(project_id)
+        return previous
+    
+    def known_images(self, project_id):
+        """Image URL -> local path recorded for a project last time."""
+        return dict(self.entries.get(project_id, {}).get("image_urls", {}))
+    
+    def record(self, project_id, url, dom_hash, content, plan, saved):
+        """Store the latest state of a project, with saved mapping image URLs to local paths."""
+        with self._lock:
+            self.entries[project_id] = {
+                "url": url,
+                "dom_hash": dom_hash,
+                "content": content,
+                "plan": [[category, src, str(filepath), local_path] for category, src, filepath, local_path in plan],
+                "image_urls": dict(saved),
+            }
+    
+    def save(self):
+        """Write the manifest atomically."""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+def fetch_project_page(full_url):
+    """Fetch the raw HTML of a project page."""
+    return http_cache.get_page(full_url).content
+
+def parse_project_page(project_id, full_url, html, known_hash=None):
+    """
+    CPU-bound half of processing a page: parse the raw HTML bytes, hash the
+    relevant DOM, extract the content and plan the image downloads. If the
+    hash equals known_hash (the last scrape's), nothing is extracted and the
+    result is marked unchanged. Takes and returns only plain data so it can
+    run in a worker process.
+    """
+    soup = make_soup(html)
+    dom_hash = relevant_dom_hash(soup)
+    if known_hash is not None and dom_hash == known_hash:
+        return {"dom_hash": dom_hash, "unchanged": True}
+    return {
+        "dom_hash": dom_hash,
+        "content": extract_content(soup),
+        "plan": plan_images(soup, project_id, full_url),
+    }
+
+def finish_project(project_id, full_url, parsed, manifest=None):
+    """
+    I/O half of processing a page: download the planned images and record
+    the result. With a manifest, unchanged pages are copied forward from the
+    previous output and only new image URLs are downloaded.
+    """
+    if manifest is not None:
+        previous = manifest.reuse(project_id, parsed["dom_hash"])
+        if previous is not None:
+            print(f"  [{project_id}] Unchanged, copied forward")
+            return previous
+        if parsed.get("unchanged"):
+            # Same page, but its output or an image is missing: redo the downloads from the last plan
+            parsed = manifest.previous_parse(project_id)
+    
+    content = parsed["content"]
+    plan = parsed["plan"]
+    print(f"  [{project_id}] Title: {content['title']}")
+    
+    known_images = manifest.known_images(project_id) if manifest is not None else None
+    saved = fetch_planned_images(plan, known_images)
+    images = group_images(plan, saved)
+    if manifest is not None:
+        manifest.record(project_id, full_url, parsed["dom_hash"], content, plan, saved)
+    print(f"  [{project_id}] Detailed: {len(images['detailed'])}, Design System: {len(images['designSystem'])}"
+          f"{', Old Version: Yes' if images['oldVersion'] else ''}")
+    
+    return {
+        "project_id": project_id,
+        "content": content,
+        "images": images
+    }
+
+def process_project_page(project_id, full_url, html, manifest=None):
+    """Extract content and download images from a fetched project page."""
+    known_hash = manifest.known_hash(project_id) if manifest is not None else None
+    return finish_project(project_id, full_url, parse_project_page(project_id, full_url, html, known_hash), manifest)
+
+def scrape_project(project_id, project_url, manifest=None):
     """Scrape a single project."""
     print(f"\n[{project_id}]")
     print(f"  URL: {BASE_URL}{project_url}")
     
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
         full_url = urljoin(BASE_URL, project_url)
-        response = requests.get(full_url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        content = extract_content(soup)
-        print(f"  Title: {content['title']}")
-        
-        print(f"  Downloading images...")
-        images = extract_and_download_images(soup, project_id, full_url)
-        print(f"    - Detailed: {len(images['detailed'])}")
-        print(f"    - Design System: {len(images['designSystem'])}")
-        if images['oldVersion']:
-            print(f"    - Old Version: Yes")
-        
-        return {
-            "project_id": project_id,
-            "content": content,
-            "images": images
-        }
+        html = fetch_project_page(full_url)
+        return process_project_page(project_id, full_url, html, manifest)
     except Exception as e:
         print(f"  ERROR: {e}")
         return None
 
+class HostBudget:
+    """
+    Per-host cap on parallel page fetches. Request pacing is left to the
+    shared rate limiter in http_client, which adapts to throttling.
+    """
+    
+    def __init__(self, limit=PER_HOST_LIMIT):
+        self.limit = limit
+        self._slots = {}
+    
+    async def acquire(self, host):
+        if host not in self._slots:
+            self._slots[host] = asyncio.Semaphore(self.limit)
+        await self._slots[host].acquire()
+    
+    def release(self, host):
+        self._slots[host].release()
+
+async def crawl_async(project_urls, concurrency=MAX_CONCURRENCY, per_host=PER_HOST_LIMIT,
+                      manifest=None, parse_workers=None, queue_size=QUEUE_SIZE, on_result=None):
+    """
+    Crawl all projects as a three-stage pipeline, returning results in
+    project_urls order:
+      fetch     - up to `concurrency` page downloads, `per_host` per host
+      parse     - BeautifulSoup work in a process pool of `parse_workers`
+      download  - image downloads and manifest updates in threads
+    The stages are joined by queues of `queue_size` items. A fetcher holds its
+    slot until the parse queue accepts its page, and parsers wait on the
+    download queue, so a slow stage throttles the ones before it instead of
+    piling pages up in memory. on_result is called with each finished
+    project's result as soon as it is ready.
+    """
+    parse_workers = parse_workers or os.cpu_count() or 1
+    limit = asyncio.Semaphore(concurrency)
+    budget = HostBudget(per_host)
+    pages = asyncio.Queue(maxsize=queue_size)
+    parsed_pages = asyncio.Queue(maxsize=queue_size)
+    loop = asyncio.get_running_loop()
+    results = {}
+    
+    async def fetch(project_id, project_url):
+        full_url = urljoin(BASE_URL, project_url)
+        host = urlparse(full_url).netloc
+        async with limit:
+            await budget.acquire(host)
+            try:
+                print(f"[{project_id}] Fetching {full_url}")
+                html = await asyncio.to_thread(fetch_project_page, full_url)
+            except Exception as e:
+                print(f"  [{project_id}] ERROR: {e}")
+                return
+            finally:
+                budget.release(host)
+            await pages.put((project_id, full_url, html))
+    
+    async def parse(pool):
+        while (item := await pages.get()) is not None:
+            project_id, full_url, html = item
+            try:
+                known_hash = manifest.known_hash(project_id) if manifest is not None else None
+                parsed = await loop.run_in_executor(pool, parse_project_page, project_id, full_url, html, known_hash)
+            except Exception as e:
+                print(f"  [{project_id}] ERROR: {e}")
+                continue
+            await parsed_pages.put((project_id, full_url, parsed))
+    
+    async def download():
+        while (item := await parsed_pages.get()) is not None:
+            project_id, full_url, parsed = item
+            try:
+                result = await asyncio.to_thread(finish_project, project_id, full_url, parsed, manifest)
+            except Exception as e:
+                print(f"  [{project_id}] ERROR: {e}")
+                continue
+            if result:
+                results[project_id] = result
+                if on_result is not None:
+                    await asyncio.to_thread(on_result, result)
+    
+    # spawn: forking a process that already runs I/O threads is unsafe
+    with ProcessPoolExecutor(parse_workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        parsers = [asyncio.create_task(parse(pool)) for _ in range(parse_workers)]
+        downloaders = [asyncio.create_task(download()) for _ in range(concurrency)]
+        
+        await asyncio.gather(*(fetch(project_id, project_url) for project_id, project_url in project_urls.items()))
+        for _ in parsers:
+            await pages.put(None)
+        await asyncio.gather(*parsers)
+        for _ in downloaders:
+            await parsed_pages.put(None)
+        await asyncio.gather(*downloaders)
+    
+    # Keep the same ordering as the serial crawl
+    return {project_id: results[project_id] for project_id in project_urls if project_id in results}
+
+def parse_args():
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Scrape all project pages from bcampbelldesigns.com")
+    parser.add_argument('--concurrent', action='store_true',
+                        help="Crawl pages concurrently instead of one at a time")
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENCY,
+                        help=f"Maximum pages in flight (default: {MAX_CONCURRENCY})")
+    parser.add_argument('--per-host', type=int, default=PER_HOST_LIMIT,
+                        help=f"Maximum simultaneous requests per host (default: {PER_HOST_LIMIT})")
+    parser.add_argument('--rate', type=float, default=rate_limit.INITIAL_RATE,
+                        help=f"Starting requests/second per host, adapted as the crawl runs (default: {rate_limit.INITIAL_RATE})")
+    parser.add_argument('--max-rate', type=float, default=rate_limit.MAX_RATE,
+                        help=f"Highest requests/second per host (default: {rate_limit.MAX_RATE})")
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help="Processes parsing pages in a concurrent crawl (default: CPU count)")
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE,
+                        help=f"Pages buffered between pipeline stages (default: {QUEUE_SIZE})")
+    parser.add_argument('--full', action='store_true',
+                        help="Re-extract every project instead of only those whose page changed")
+    parser.add_argument('--buffer-size', type=int, default=http_client.BUFFER_SIZE,
+                        help=f"Bytes buffered per image download chunk (default: {http_client.BUFFER_SIZE})")
+    return parser.parse_args()
+
 def main():
     """Main function."""
+    args = parse_args()
+    http_client.configure(buffer_size=args.buffer_size)
+    rate_limit.limiter.configure(initial_rate=args.rate, max_rate=args.max_rate)
+    
     print("="*70)
     print("Scraping All Projects")
     print("="*70)
     
-    all_data = {}
+    start = time.perf_counter()
+    manifest = ScrapeManifest(full=args.full)
+    # Each finished project is appended (and fsynced) right away, so a crash
+    # keeps completed work and downstream scripts can follow the stream
+    stream = project_stream.ProjectStreamWriter(OUTPUT_JSONL)
     
-    for project_id, project_url in PROJECT_URL_MAP.items():
-        result = scrape_project(project_id, project_url)
-        if result:
-            all_data[project_id] = result
-        time.sleep(1)  # Be nice to server
+    if args.concurrent:
+        print(f"Concurrent crawl: {args.concurrency} in flight, {args.per_host} per host, "
+              f"{args.parse_workers or os.cpu_count()} parse workers")
+        all_data = asyncio.run(crawl_async(PROJECT_URL_MAP, args.concurrency, args.per_host,
+                                           manifest, args.parse_workers, args.queue_size, stream.append))
+    else:
+        all_data = {}
+        for project_id, project_url in PROJECT_URL_MAP.items():
+            result = scrape_project(project_id, project_url, manifest)
+            if result:
+                all_data[project_id] = result
+                stream.append(result)
     
-    # Save to JSON
-    with open("all_projects_scraped.json", 'w', encoding='utf-8') as f:
-        json.dump(all_data, f, indent=2, ensure_ascii=False)
+    # Mark the stream complete and compact it into the JSON output
+    stream.close()
+    project_stream.compact(OUTPUT_JSONL, OUTPUT_JSON, order=PROJECT_URL_MAP)
+    manifest.save()
     
     print(f"\n{'='*70}")
-    print(f"Complete! Scraped {len(all_data)} projects")
-    print(f"Saved to: all_projects_scraped.json")
+    print(f"Complete! Scraped {len(all_data)} projects in {time.perf_counter() - start:.1f}s")
+    print(f"Re-extracted: {len(all_data) - len(manifest.unchanged)}, unchanged: {len(manifest.unchanged)}")
+    print(f"Saved to: {OUTPUT_JSON} (stream: {OUTPUT_JSONL})")
+    http_client.print_connection_stats()
+    http_cache.print_cache_stats()
     print(f"{'='*70}")
 
 if __name__ == "__main__":
@@ -5,12 +5,14 @@ and save them to a local 'images' folder.
 """
 
 import os
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import re
 from pathlib import Path
 
+import http_cache
+import http_client
+from html_parsing import make_soup, IMAGES_AND_STYLES, INLINE_STYLES
+
 # Configuration
 BASE_URL = "https://www.bcampbelldesigns.com/"
 IMAGES_DIR = Path("images")
@@ -24,13 +26,9 @@ def setup_directories():
 def get_page_content(url):
     """Fetch the HTML content from a URL."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        response = http_cache.get_page(url)
         return response.text
-    except requests.RequestException as e:
+    except http_client.requests.RequestException as e:
         print(f"Error fetching {url}: {e}")
         return None
 
@@ -43,24 +41,7 @@ def is_image_url(url):
 
 def download_image(image_url, filename):
     """Download an image from URL and save it."""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(image_url, headers=headers, timeout=30, stream=True)
-        response.raise_for_status()
-        
-        filepath = OUTPUT_DIR / filename
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        file_size = filepath.stat().st_size
-        print(f"  ✓ Downloaded: {filename} ({file_size:,} bytes)")
-        return True
-    except requests.RequestException as e:
-        print(f"  ✗ Failed to download {image_url}: {e}")
-        return False
+    return http_client.download_image(image_url, str(OUTPUT_DIR / filename), fix_extension=False) is not None
 
 def sanitize_filename(url):
     """Create a safe filename from URL."""
@@ -94,7 +75,9 @@ def scrape_images_from_page(url):
     if not html_content:
         return []
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Partial parses: <img>/<style> tags, and elements carrying inline styles
+    soup = make_soup(html_content, parse_only=IMAGES_AND_STYLES)
+    styled = make_soup(html_content, parse_only=INLINE_STYLES)
     image_urls = set()
     
     # Find all img tags
@@ -120,7 +103,7 @@ def scrape_images_from_page(url):
             image_urls.add(absolute_url)
     
     # Also check for background images in CSS
-    style_tags = soup.find_all(attrs={'style': True})
+    style_tags = styled.find_all(attrs={'style': True})
     for tag in style_tags:
         style = tag.get('style', '')
         # Look for url(...) patterns
@@ -219,6 +202,8 @@ def main():
     print(f"Download complete!")
     print(f"Successfully downloaded: {downloaded_count}/{len(unique_images)} images")
     print(f"Saved to: {OUTPUT_DIR.absolute()}")
+    http_client.print_connection_stats()
+    http_cache.print_cache_stats()
     print(f"{'=' * 60}")
 
 if __name__ == "__main__":
@@ -5,10 +5,11 @@ and download them to public/images/portfolio with proper naming.
 
 import os
 import re
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import time
+
+import http_cache
+import http_client
+from html_parsing import make_soup
+from homepage_index import HomepageIndex
 
 # Base URL
 BASE_URL = "https://www.bcampbelldesigns.com/"
@@ -53,143 +54,6 @@ def slugify(text):
     # Remove leading/trailing hyphens
     return text.strip('-')
 
-def normalize_title(title):
-    """Normalize title for matching (case-insensitive, strip whitespace)."""
-    return title.strip().lower()
-
-def find_project_images(soup, project_title):
-    """
-    Find project images from the soup. Tries multiple strategies:
-    1. Look for project cards/items with matching title
-    2. Look for images in project sections
-    3. Look for thumbnail images
-    4. Match by filename patterns
-    """
-    images = []
-    normalized_title = normalize_title(project_title)
-    
-    # Extract key words from title (words longer than 3 chars)
-    key_words = [word.lower() for word in project_title.split() if len(word) > 3]
-    
-    # Strategy 1: Find project cards/items by title text
-    # Look for elements containing the project title
-    project_elements = soup.find_all(string=re.compile(re.escape(project_title), re.IGNORECASE))
-    
-    for element in project_elements:
-        # Navigate up to find the parent container
-        parent = element.parent
-        for _ in range(7):  # Go up max 7 levels
-            if parent is None:
-                break
-            # Look for images in this container
-            imgs = parent.find_all('img')
-            for img in imgs:
-                src = img.get('src') or img.get('data-src') or img.get('data-lazy-src') or img.get('data-original')
-                if src and not src.startswith('data:'):
-                    images.append(src)
-            # Also check for background images in style attributes
-            if parent.get('style'):
-                bg_match = re.search(r'url\(["\']?([^"\')]+)["\']?\)', parent.get('style', ''))
-                if bg_match:
-                    images.append(bg_match.group(1))
-            parent = parent.parent
-    
-    # Strategy 2: Look for project cards with data attributes or classes
-    project_cards = soup.find_all(['div', 'article', 'section', 'li'], 
-                                  class_=re.compile(r'project|portfolio|work|item|card|gallery', re.I))
-    
-    for card in project_cards:
-        # Check if this card contains our project title
-        card_text = card.get_text().lower()
-        if normalized_title in card_text or any(
-            word in card_text for word in key_words
-        ):
-            imgs = card.find_all('img')
-            for img in imgs:
-                src = img.get('src') or img.get('data-src') or img.get('data-lazy-src') or img.get('data-original')
-                if src and not src.startswith('data:'):
-                    images.append(src)
-            # Check for background images
-            if card.get('style'):
-                bg_match = re.search(r'url\(["\']?([^"\')]+)["\']?\)', card.get('style', ''))
-                if bg_match:
-                    images.append(bg_match.group(1))
-    
-    # Strategy 3: Look for all images and try to match by filename
-    all_imgs = soup.find_all('img')
-    for img in all_imgs:
-        src = img.get('src') or img.get('data-src') or img.get('data-lazy-src') or img.get('data-original')
-        if src and not src.startswith('data:'):
-            # Check if filename contains project keywords
-            filename = os.path.basename(urlparse(src).path).lower()
-            if any(keyword in filename for keyword in key_words):
-                images.append(src)
-    
-    # Strategy 4: Check for links that might contain project pages
-    links = soup.find_all('a', href=True)
-    for link in links:
-        link_text = link.get_text().lower()
-        href = link.get('href', '')
-        if normalized_title in link_text or any(word in link_text for word in key_words):
-            # Follow the link to find images (if it's a project detail page)
-            if href and not href.startswith('#') and not href.startswith('mailto:'):
-                # This would require additional requests - skip for now
-                pass
-    
-    # Remove duplicates and filter out small images (likely icons)
-    unique_images = []
-    seen = set()
-    for img_url in images:
-        if img_url in seen:
-            continue
-        seen.add(img_url)
-        # Skip very small images (likely icons/logos)
-        if any(skip in img_url.lower() for skip in ['logo', 'icon', 'favicon', 'avatar', 'social']):
-            continue
-        unique_images.append(img_url)
-    
-    return unique_images
-
-def download_image(url, filepath):
-    """Download an image from URL to filepath."""
-    try:
-        # Handle relative URLs
-        if not url.startswith('http'):
-            url = urljoin(BASE_URL, url)
-        
-        response = requests.get(url, timeout=30, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        response.raise_for_status()
-        
-        # Determine file extension from URL or content-type
-        ext = os.path.splitext(urlparse(url).path)[1]
-        if not ext or ext not in ['.jpg', '.jpeg', '.png', '.webp', '.gif']:
-            content_type = response.headers.get('content-type', '')
-            if 'jpeg' in content_type or 'jpg' in content_type:
-                ext = '.jpg'
-            elif 'png' in content_type:
-                ext = '.png'
-            elif 'webp' in content_type:
-                ext = '.webp'
-            else:
-                ext = '.jpg'  # Default
-        
-        # Update filepath with extension
-        if not filepath.endswith(ext):
-            filepath = os.path.splitext(filepath)[0] + ext
-        
-        # Save the image
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
-        
-        print(f"✓ Downloaded: {os.path.basename(filepath)}")
-        return True
-    except Exception as e:
-        print(f"✗ Error downloading {url}: {e}")
-        return False
-
 def main():
     """Main scraping function."""
     print(f"Scraping portfolio images from {BASE_URL}")
@@ -201,15 +65,16 @@ def main():
     try:
         # Fetch the main page
         print("Fetching main page...")
-        response = requests.get(BASE_URL, timeout=30, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        response.raise_for_status()
+        response = http_cache.get_page(BASE_URL)
         
         # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         print("✓ Page loaded successfully\n")
         
+        # Index the page once and resolve every project against it
+        index = HomepageIndex(soup, PROJECT_MAPPING, card_backgrounds=True)
+        candidates = index.resolve_all()
+        
         # Process each project
         downloaded = 0
         failed = []
@@ -218,7 +83,7 @@ def main():
             print(f"Processing: {project_title}")
             
             # Find images for this project
-            images = find_project_images(soup, project_title)
+            images = candidates[project_title]
             
             if not images:
                 print(f"  ⚠ No images found for '{project_title}'")
@@ -232,13 +97,10 @@ def main():
             
             # Download the image
             filepath = os.path.join(OUTPUT_DIR, f"{slug}.jpg")
-            if download_image(image_url, filepath):
+            if http_client.download_image(image_url, filepath, base_url=BASE_URL, default_ext='.jpg'):
                 downloaded += 1
             else:
                 failed.append(project_title)
-            
-            # Be polite - small delay between requests
-            time.sleep(0.5)
         
         # Summary
         print(f"\n{'='*60}")
@@ -256,7 +118,11 @@ def main():
             print("  2. Download images manually and place them in the output directory")
             print("  3. Update the script to match your site's HTML structure")
         
-    except requests.RequestException as e:
+        http_client.print_connection_stats()
+        
+        http_cache.print_cache_stats()
+        
+    except http_client.requests.RequestException as e:
         print(f"Error fetching website: {e}")
         print("\nTroubleshooting:")
         print("  1. Check your internet connection")
@@ -4,19 +4,21 @@ Script to scrape project thumbnail images from bcampbelldesigns.com
 and match them to projects in projects.ts, then download and rename them.
 """
 
-import os
 import re
 import json
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+import sqlite3
 from pathlib import Path
 from difflib import SequenceMatcher
 
+import http_cache
+import http_client
+from html_parsing import make_soup
+from homepage_index import HomepageIndex
+from project_store import STORE_PATH, ProjectStore
+
 # Configuration
 BASE_URL = "https://www.bcampbelldesigns.com/"
 OUTPUT_DIR = Path("public/images/projects")
-PROJECTS_TS_PATH = Path("data/projects.ts")
 
 def slugify(text):
     """Convert text to a URL-friendly slug."""
@@ -32,32 +34,18 @@ def similarity(a, b):
     """Calculate similarity ratio between two strings."""
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
-def extract_projects_from_ts():
-    """Extract project data from projects.ts file."""
-    projects = []
+def load_projects():
+    """Project ids, titles and current images from the project store."""
     try:
-        with open(PROJECTS_TS_PATH, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract project objects using regex
-        # Look for patterns like: { id: "...", title: "...", ... }
-        pattern = r'{\s*id:\s*"([^"]+)",\s*title:\s*"([^"]+)",[^}]+image:\s*"([^"]+)"'
-        matches = re.finditer(pattern, content, re.DOTALL)
-        
-        for match in matches:
-            project_id = match.group(1)
-            title = match.group(2)
-            current_image = match.group(3)
-            projects.append({
-                'id': project_id,
-                'title': title,
-                'current_image': current_image
-            })
-        
-        print(f"✓ Found {len(projects)} projects in projects.ts")
+        with ProjectStore() as store:
+            projects = [{'id': project.id, 'title': project.title, 'current_image': project.image}
+                        for project in store.projects()]
+        if not projects:
+            raise LookupError(f"no projects in {STORE_PATH}")
+        print(f"✓ Found {len(projects)} projects in {STORE_PATH}")
         return projects
-    except Exception as e:
-        print(f"✗ Error reading projects.ts: {e}")
+    except (sqlite3.Error, LookupError) as e:
+        print(f"✗ Error reading the project store: {e}")
         # Fallback: return known projects
         return [
             {"id": "caesars-palace-online-casino", "title": "Caesars Palace Online Casino"},
@@ -85,113 +73,6 @@ def extract_projects_from_ts():
             {"id": "other-digital-art", "title": "Other Digital Art"},
         ]
 
-def find_project_images(soup, project_title):
-    """
-    Find project images from the soup using multiple strategies.
-    Returns list of image URLs.
-    """
-    images = []
-    normalized_title = normalize_title(project_title)
-    key_words = [word.lower() for word in project_title.split() if len(word) > 3]
-    
-    # Strategy 1: Find project cards/items by title text
-    project_elements = soup.find_all(string=re.compile(re.escape(project_title), re.IGNORECASE))
-    
-    for element in project_elements:
-        parent = element.parent
-        for _ in range(7):
-            if parent is None:
-                break
-            imgs = parent.find_all('img')
-            for img in imgs:
-                src = img.get('src') or img.get('data-src') or img.get('data-lazy-src') or img.get('data-original')
-                if src and not src.startswith('data:'):
-                    images.append(src)
-            if parent.get('style'):
-                bg_match = re.search(r'url\(["\']?([^"\')]+)["\']?\)', parent.get('style', ''))
-                if bg_match:
-                    images.append(bg_match.group(1))
-            parent = parent.parent
-    
-    # Strategy 2: Look for project cards with matching classes
-    project_cards = soup.find_all(['div', 'article', 'section', 'li'], 
-                                  class_=re.compile(r'project|portfolio|work|item|card|gallery', re.I))
-    
-    for card in project_cards:
-        card_text = card.get_text().lower()
-        if normalized_title in card_text or any(word in card_text for word in key_words):
-            imgs = card.find_all('img')
-            for img in imgs:
-                src = img.get('src') or img.get('data-src') or img.get('data-lazy-src') or img.get('data-original')
-                if src and not src.startswith('data:'):
-                    images.append(src)
-    
-    # Strategy 3: Match by filename
-    all_imgs = soup.find_all('img')
-    for img in all_imgs:
-        src = img.get('src') or img.get('data-src') or img.get('data-lazy-src') or img.get('data-original')
-        if src and not src.startswith('data:'):
-            filename = os.path.basename(urlparse(src).path).lower()
-            if any(keyword in filename for keyword in key_words):
-                images.append(src)
-    
-    # Remove duplicates and filter
-    unique_images = []
-    seen = set()
-    for img_url in images:
-        if img_url in seen:
-            continue
-        seen.add(img_url)
-        # Skip small images (likely icons/logos)
-        if any(skip in img_url.lower() for skip in ['logo', 'icon', 'favicon', 'avatar', 'social']):
-            continue
-        unique_images.append(img_url)
-    
-    return unique_images
-
-def normalize_title(title):
-    """Normalize title for matching."""
-    return title.strip().lower()
-
-def download_image(url, filepath):
-    """Download an image from URL to filepath."""
-    try:
-        if not url.startswith('http'):
-            url = urljoin(BASE_URL, url)
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-        
-        # Determine file extension
-        ext = os.path.splitext(urlparse(url).path)[1]
-        if not ext or ext not in ['.jpg', '.jpeg', '.png', '.webp', '.gif']:
-            content_type = response.headers.get('content-type', '')
-            if 'jpeg' in content_type or 'jpg' in content_type:
-                ext = '.jpg'
-            elif 'png' in content_type:
-                ext = '.png'
-            elif 'webp' in content_type:
-                ext = '.webp'
-            else:
-                ext = '.jpg'
-        
-        if not filepath.endswith(ext):
-            filepath = os.path.splitext(filepath)[0] + ext
-        
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
-        
-        file_size = os.path.getsize(filepath)
-        print(f"  ✓ Downloaded: {os.path.basename(filepath)} ({file_size:,} bytes)")
-        return filepath
-    except Exception as e:
-        print(f"  ✗ Error downloading {url}: {e}")
-        return None
-
 def main():
     """Main scraping function."""
     print("=" * 70)
@@ -203,21 +84,21 @@ def main():
     # Create output directory
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Get projects from projects.ts
-    projects = extract_projects_from_ts()
+    # Get projects from the project store (the data behind projects.ts)
+    projects = load_projects()
     
     try:
         # Fetch the main page
         print("Fetching main page...")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(BASE_URL, headers=headers, timeout=30)
-        response.raise_for_status()
+        response = http_cache.get_page(BASE_URL)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         print("✓ Page loaded successfully\n")
         
+        # Index the page once and resolve every project against it
+        index = HomepageIndex(soup, [project['title'] for project in projects])
+        candidates = index.resolve_all()
+        
         # Process each project
         downloaded = {}
         failed = []
@@ -228,7 +109,7 @@ def main():
             print(f"Processing: {project_title}")
             
             # Find images for this project
-            images = find_project_images(soup, project_title)
+            images = candidates[project_title]
             
             if not images:
                 print(f"  ⚠ No images found")
@@ -245,7 +126,7 @@ def main():
             filepath = OUTPUT_DIR / filename
             
             # Download the image
-            downloaded_path = download_image(image_url, str(filepath))
+            downloaded_path = http_client.download_image(image_url, str(filepath), base_url=BASE_URL, default_ext='.jpg')
             if downloaded_path:
                 downloaded[project_id] = {
                     'title': project_title,
@@ -285,8 +166,10 @@ def main():
                 print()
         
         print("=" * 70)
+        http_client.print_connection_stats()
+        http_cache.print_cache_stats()
         
-    except requests.RequestException as e:
+    except http_client.requests.RequestException as e:
         print(f"Error fetching website: {e}")
         print("\nTroubleshooting:")
         print("  1. Check your internet connection")
@@ -3,23 +3,20 @@
 First, extract actual project URLs from the homepage
 """
 
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import json
 
+import http_cache
+from html_parsing import make_soup, SoupStrainer
+
 BASE_URL = "https://www.bcampbelldesigns.com"
 
 def get_project_urls():
     """Extract project URLs from the homepage."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
-    response = requests.get(BASE_URL, headers=headers, timeout=30)
-    response.raise_for_status()
+    response = http_cache.get_page(BASE_URL)
     
-    soup = BeautifulSoup(response.content, 'html.parser')
+    # Only the links matter here
+    soup = make_soup(response.content, parse_only=SoupStrainer('a', href=True))
     
     # Find all links that point to portfolio pages
     project_urls = {}
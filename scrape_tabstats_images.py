@@ -4,12 +4,14 @@ Script to scrape Tabstats Dashboard case study images from bcampbelldesigns.com
 """
 
 import os
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 import re
 
+import http_cache
+import http_client
+from html_parsing import ImagePage
+
 BASE_URL = "https://www.bcampbelldesigns.com/portfolio/tabstats-dashboard-companion"
 OUTPUT_DIR = Path("public/images/projects/tabstats")
 DESIGN_SYSTEM_DIR = OUTPUT_DIR / "design-system"
@@ -23,45 +25,6 @@ def slugify_filename(filename):
     name = re.sub(r'[-\s]+', '-', name)
     return f"{name}{ext}"
 
-def download_image(url, filepath):
-    """Download an image from URL to filepath."""
-    try:
-        if not url.startswith('http'):
-            url = urljoin(BASE_URL, url)
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-        
-        # Determine file extension
-        ext = os.path.splitext(urlparse(url).path)[1]
-        if not ext or ext not in ['.jpg', '.jpeg', '.png', '.webp']:
-            content_type = response.headers.get('content-type', '')
-            if 'jpeg' in content_type or 'jpg' in content_type:
-                ext = '.jpg'
-            elif 'png' in content_type:
-                ext = '.png'
-            elif 'webp' in content_type:
-                ext = '.webp'
-            else:
-                ext = '.png'
-        
-        if not filepath.endswith(ext):
-            filepath = os.path.splitext(filepath)[0] + ext
-        
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
-        
-        file_size = os.path.getsize(filepath)
-        print(f"  ✓ Downloaded: {os.path.basename(filepath)} ({file_size:,} bytes)")
-        return filepath
-    except Exception as e:
-        print(f"  ✗ Error downloading {url}: {e}")
-        return None
-
 def main():
     """Main scraping function."""
     print("=" * 70)
@@ -77,17 +40,14 @@ def main():
     try:
         # Fetch the page
         print("Fetching case study page...")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(BASE_URL, headers=headers, timeout=30)
-        response.raise_for_status()
+        response = http_cache.get_page(BASE_URL)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Only <img> tags are parsed up front; the full tree is built on demand for context
+        page = ImagePage(response.content)
         print("✓ Page loaded successfully\n")
         
         # Find all images
-        all_images = soup.find_all('img')
+        all_images = page.images
         downloaded = []
         
         # Image filename patterns to look for
@@ -106,7 +66,7 @@ def main():
         
         print("Searching for images...\n")
         
-        for img in all_images:
+        for index, img in enumerate(all_images):
             src = img.get('src') or img.get('data-src') or img.get('data-lazy-src')
             if not src or src.startswith('data:'):
                 continue
@@ -140,7 +100,7 @@ def main():
                 filepath = OUTPUT_DIR / slugged_name
             else:
                 # Try to determine from context
-                parent_text = img.find_parent().get_text().lower() if img.find_parent() else ''
+                parent_text = page.parent_text(index)
                 if 'design system' in parent_text or 'component' in parent_text:
                     slugged_name = slugify_filename(filename)
                     filepath = DESIGN_SYSTEM_DIR / f"design-system-{slugged_name}"
@@ -149,7 +109,7 @@ def main():
                     filepath = OUTPUT_DIR / slugged_name
             
             # Download the image
-            if download_image(src, str(filepath)):
+            if http_client.download_image(src, str(filepath), base_url=BASE_URL):
                 downloaded.append(str(filepath))
         
         # Summary
@@ -164,7 +124,11 @@ def main():
             for img_path in downloaded:
                 print(f"  - {img_path}")
         
-    except requests.RequestException as e:
+        http_client.print_connection_stats()
+        
+        http_cache.print_cache_stats()
+        
+    except http_client.requests.RequestException as e:
         print(f"Error fetching website: {e}")
     except Exception as e:
         print(f"Unexpected error: {e}")
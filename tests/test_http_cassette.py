@@ -0,0 +1,51 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from http_cassette import Cassette, CassetteAdapter
+
+@pytest.fixture
+def throttling_server(monkeypatch):
+    """Answer the first request with 429, then 200."""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            status, body = (429, b"slow down") if len(hits) == 1 else (200, b"<html>page</html>")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    yield f"http://127.0.0.1:{server.server_port}/page", hits
+    server.shutdown()
+    server.server_close()
+
+def session_for(cassette_dir, mode):
+    session = requests.Session()
+    adapter = CassetteAdapter(Cassette(cassette_dir), mode)
+    session.mount("http://", adapter)
+    return session
+
+def test_throttled_responses_are_not_recorded(tmp_path, throttling_server):
+    url, hits = throttling_server
+
+    recorder = session_for(tmp_path, 'record')
+    assert recorder.get(url).status_code == 429
+    assert recorder.get(url).status_code == 200
+    assert len(hits) == 2
+
+    replayed = session_for(tmp_path, 'replay').get(url)
+    assert replayed.status_code == 200
+    assert replayed.content == b"<html>page</html>"
+    assert len(hits) == 2
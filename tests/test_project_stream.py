@@ -0,0 +1,30 @@
+import json
+
+import project_stream
+
+def write_lines(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+def test_compacting_an_unfinished_stream_keeps_unreached_projects(tmp_path):
+    json_path, jsonl_path = tmp_path / "out.json", tmp_path / "out.jsonl"
+    json_path.write_text(json.dumps({
+        "alpha": {"project_id": "alpha", "content": "old"},
+        "beta": {"project_id": "beta", "content": "old"},
+    }))
+    write_lines(jsonl_path, [{"project_id": "alpha", "content": "new"}])
+
+    assert project_stream.compact(jsonl_path, json_path) == 2
+    projects = json.loads(json_path.read_text())
+    assert projects == {
+        "alpha": {"project_id": "alpha", "content": "new"},
+        "beta": {"project_id": "beta", "content": "old"},
+    }
+    assert project_stream.is_complete(jsonl_path)
+
+def test_compacting_a_complete_stream_replaces_the_json(tmp_path):
+    json_path, jsonl_path = tmp_path / "out.json", tmp_path / "out.jsonl"
+    json_path.write_text(json.dumps({"beta": {"project_id": "beta"}}))
+    write_lines(jsonl_path, [{"project_id": "alpha"}, {project_stream.COMPLETE_MARKER: True, "projects": 1}])
+
+    assert project_stream.compact(jsonl_path, json_path) == 1
+    assert list(json.loads(json_path.read_text())) == ["alpha"]
@@ -0,0 +1,57 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import scrape_all_projects_final as scraper
+
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 64 + b"\xff\xd9"
+
+@pytest.fixture
+def image_server(monkeypatch):
+    """Serve a JPEG under a Squarespace-like path and count the requests."""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(JPEG)))
+            self.end_headers()
+            self.wfile.write(JPEG)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    yield f"http://127.0.0.1:{server.server_port}/squarespace-cdn/shot.jpg", hits
+    server.shutdown()
+    server.server_close()
+
+def scrape(tmp_path, html):
+    manifest = scraper.ScrapeManifest(tmp_path / "scrape_manifest.json", tmp_path / "all_projects_scraped.json")
+    result = scraper.process_project_page("demo", "https://example.com/demo", html, manifest)
+    manifest.save()
+    return result
+
+@pytest.mark.parametrize("keep_output", [True, False])
+def test_rescrape_does_not_download_corrected_extension_again(tmp_path, monkeypatch, image_server, keep_output):
+    url, hits = image_server
+    monkeypatch.chdir(tmp_path)
+    html = f'<html><body><h1>Demo</h1><img src="{url}"></body></html>'.encode()
+
+    first = scrape(tmp_path, html)
+    saved = first["images"]["detailed"]
+    assert saved == ["public/images/projects/demo/shotjpg.jpg"]
+    assert (tmp_path / saved[0]).exists()
+    assert len(hits) == 1
+    if keep_output:
+        (tmp_path / "all_projects_scraped.json").write_text(json.dumps({"demo": first}))
+
+    second = scrape(tmp_path, html)
+    assert second["images"]["detailed"] == saved
+    assert len(hits) == 1